@@ -4,167 +4,2534 @@ import os
 import sys
 import xml.etree.ElementTree as ET
 import subprocess
+import argparse
+import threading
+import queue
 import requests
-from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse, parse_qs, quote
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
+import asyncio
+import hashlib
+import re
+import json
+import fnmatch
+import shutil
+import signal
+import random
+import heapq
+from collections import deque
+from datetime import datetime, timezone
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import jwt
+except ImportError:
+    jwt = None
+
+def dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+def kill_process_group(pid):
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+class GitHubAPIError(Exception):
+    def __init__(self, response=None, status_code=None, text=""):
+        if response is not None:
+            status_code, text = response.status_code, response.text
+        super().__init__(f"{status_code} - {text}")
+        self.status_code = status_code
+
+
+class GitHubRateLimiter:
+    def __init__(self, max_rate=10.0, burst=10, max_retries=5):
+        self.max_rate = float(max_rate)
+        self.burst = burst
+        self.max_retries = max_retries
+        self.rate = self.max_rate
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.remaining = None
+        self.reset_at = None
+        self.throttled = 0
+        self.waited_seconds = 0.0
+        self.lock = threading.Lock()
+    
+    def reserve(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            
+            wait = max(self.blocked_until - now, 0.0)
+            if self.tokens < 0:
+                wait = max(wait, -self.tokens / self.rate)
+            if wait > 0:
+                self.throttled += 1
+                self.waited_seconds += wait
+            return wait
+    
+    def update(self, status_code, headers, text=""):
+        with self.lock:
+            now = time.monotonic()
+            remaining = headers.get("X-RateLimit-Remaining")
+            reset = headers.get("X-RateLimit-Reset")
+            
+            if remaining is not None and reset is not None:
+                try:
+                    self.remaining = int(remaining)
+                    self.reset_at = now + max(float(reset) - time.time(), 0.0)
+                except ValueError:
+                    self.remaining = None
+            
+            if self.remaining:
+                seconds_to_reset = max(self.reset_at - now, 1.0)
+                self.rate = max(min(self.max_rate, self.remaining / seconds_to_reset), 0.01)
+            
+            retry_after = None
+            if status_code in (403, 429):
+                header = headers.get("Retry-After")
+                if header is not None:
+                    try:
+                        retry_after = float(header)
+                    except ValueError:
+                        retry_after = 60.0
+                elif self.remaining == 0:
+                    retry_after = max(self.reset_at - now, 1.0)
+                elif status_code == 429 or "secondary rate limit" in text.lower():
+                    retry_after = 60.0
+            elif self.remaining == 0:
+                self.blocked_until = max(self.blocked_until, self.reset_at)
+            
+            if retry_after is not None:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+            return retry_after
+    
+    def summary(self):
+        return f"{self.throttled} requests paced, {self.waited_seconds:.1f}s total wait"
+
+
+class PooledToken:
+    def __init__(self, token, limiter, username=None, expires_at=None):
+        self.token = token
+        self.limiter = limiter
+        self.username = username
+        self.expires_at = expires_at
+        self.retired = []
+        self.in_flight = 0
+        self.requests = 0
+        self.disabled = None
+    
+    def authorization(self):
+        return f"token {self.token}"
+    
+    def push_credential(self):
+        return f"{self.username}:{self.token}" if self.username else self.token
+    
+    def rotate(self, token, expires_at):
+        self.retired.append(self.token)
+        self.token = token
+        self.expires_at = expires_at
+    
+    def label(self):
+        if self.username:
+            return "GitHub App installation"
+        return f"...{self.token[-4:]}"
+
+
+class GitHubAppAuth:
+    def __init__(self, app_id, private_key, installation_id=None, account=None,
+                 api_url="https://api.github.com", timeout=30, refresh_margin=600):
+        self.app_id = app_id
+        self.private_key = private_key
+        self.installation_id = installation_id
+        self.account = account
+        self.api_url = api_url
+        self.timeout = timeout
+        self.refresh_margin = refresh_margin
+        self.refreshed = 0
+        self.session = None
+        self.limiter = None
+    
+    def app_jwt(self):
+        now = int(time.time())
+        payload = {"iat": now - 60, "exp": now + 540, "iss": str(self.app_id)}
+        return jwt.encode(payload, self.private_key, algorithm="RS256")
+    
+    def app_request(self, method, url):
+        attempt = 0
+        while True:
+            wait = self.limiter.reserve()
+            if wait > 0:
+                time.sleep(wait)
+            
+            response = self.session.request(
+                method,
+                url,
+                headers={"Authorization": f"Bearer {self.app_jwt()}", "Accept": "application/vnd.github.v3+json"},
+                timeout=self.timeout
+            )
+            retry_after = self.limiter.update(response.status_code, response.headers, response.text)
+            if retry_after is None or attempt >= self.limiter.max_retries:
+                break
+            
+            attempt += 1
+            print(f"WARNING: GitHub rate limit hit, retrying in {retry_after:.0f}s")
+        
+        if response.status_code >= 400:
+            raise GitHubAPIError(response)
+        return response
+    
+    def app_pages(self, path):
+        url = f"{self.api_url}{path}"
+        while url:
+            response = self.app_request("GET", url)
+            yield from response.json()
+            url = response.links.get("next", {}).get("url")
+    
+    def find_installation(self):
+        if self.installation_id:
+            return self.installation_id
+        
+        installations = list(self.app_pages("/app/installations?per_page=100"))
+        matches = [installation for installation in installations
+                   if not self.account or installation["account"]["login"].lower() == self.account.lower()]
+        if len(matches) != 1:
+            raise ValueError(f"Found {len(matches)} installations of GitHub App {self.app_id} "
+                             f"for '{self.account}', pass the installation ID explicitly")
+        self.installation_id = matches[0]["id"]
+        return self.installation_id
+    
+    def mint(self):
+        url = f"{self.api_url}/app/installations/{self.find_installation()}/access_tokens"
+        data = self.app_request("POST", url).json()
+        expires_at = datetime.strptime(data["expires_at"], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+        return data["token"], expires_at.timestamp()
+    
+    def connect(self, session, api_rate=10.0):
+        self.session = session
+        self.limiter = GitHubRateLimiter(max_rate=api_rate)
+        token, expires_at = self.mint()
+        entry = PooledToken(token, GitHubRateLimiter(max_rate=api_rate), "x-access-token", expires_at)
+        threading.Thread(target=self.refresh_loop, args=(entry,), daemon=True).start()
+        return entry
+    
+    def refresh_loop(self, entry):
+        while True:
+            delay = entry.expires_at - self.refresh_margin - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            
+            try:
+                token, expires_at = self.mint()
+            except Exception as e:
+                print(f"WARNING: Could not refresh the GitHub App installation token, retrying in 60s: {e}")
+                time.sleep(60)
+                continue
+            
+            entry.rotate(token, expires_at)
+            self.refreshed += 1
+
+
+class TokenPool:
+    def __init__(self, tokens, api_rate=10.0):
+        self.entries = [PooledToken(token, GitHubRateLimiter(max_rate=api_rate)) for token in dict.fromkeys(tokens)]
+        self.next_push = 0
+        self.lock = threading.Lock()
+    
+    def add(self, entry):
+        with self.lock:
+            self.entries.append(entry)
+    
+    def active(self):
+        return [entry for entry in self.entries if not entry.disabled]
+    
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            entry = min(self.active(), key=lambda entry: (
+                entry.limiter.remaining == 0 or entry.limiter.blocked_until > now,
+                entry.in_flight,
+                -(entry.limiter.remaining or 0),
+                entry.requests,
+            ))
+            entry.in_flight += 1
+            entry.requests += 1
+            return entry
+    
+    def release(self, entry):
+        with self.lock:
+            entry.in_flight -= 1
+    
+    def disable(self, entry, status_code):
+        with self.lock:
+            if entry.disabled or len(self.active()) < 2:
+                return False
+            entry.disabled = status_code
+        print(f"WARNING: GitHub token {entry.label()} got {status_code}, removed from rotation")
+        return True
+    
+    def push_credential(self):
+        with self.lock:
+            active = self.active()
+            self.next_push += 1
+            return active[self.next_push % len(active)].push_credential()
+    
+    def refresh_args(self, args):
+        for entry in self.entries:
+            for token in entry.retired:
+                args = [arg.replace(token, entry.token) for arg in args]
+        return args
+    
+    def secrets(self):
+        return [token for entry in self.entries for token in [entry.token] + entry.retired]
+    
+    def summary(self):
+        throttled = sum(entry.limiter.throttled for entry in self.entries)
+        waited = sum(entry.limiter.waited_seconds for entry in self.entries)
+        text = f"{throttled} requests paced, {waited:.1f}s total wait"
+        if len(self.entries) > 1:
+            disabled = len(self.entries) - len(self.active())
+            text += f", {len(self.entries)} tokens ({disabled} removed)"
+        return text
+
+
+class RetryPolicy:
+    def __init__(self, retries=3, base_delay=2.0, max_delay=60.0):
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retried = 0
+        self.lock = threading.Lock()
+    
+    def backoff(self, attempt):
+        with self.lock:
+            self.retried += 1
+        cap = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return cap / 2 + random.uniform(0, cap / 2)
+    
+    def is_transient_status(self, status_code):
+        return status_code >= 500
+    
+    def is_transient_git(self, output):
+        return (any(marker in output for marker in TRANSIENT_GIT_ERRORS)
+                and not any(marker in output for marker in PERMANENT_GIT_ERRORS))
+
+
+class MirrorCache:
+    def __init__(self, cache_dir, max_bytes=None):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        self.in_use = set()
+        self.evicted = 0
+        self.condition = threading.Condition()
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    def path_for(self, gitlab_url):
+        digest = hashlib.sha1(gitlab_url.encode()).hexdigest()[:16]
+        name = re.sub(r'[^A-Za-z0-9._-]', '_', gitlab_url.rstrip('/').split('/')[-1])
+        if not name.endswith('.git'):
+            name = f"{name}.git"
+        return os.path.join(self.cache_dir, f"{digest}-{name}")
+    
+    def owns(self, path):
+        return os.path.dirname(os.path.abspath(path)) == self.cache_dir
+    
+    def acquire(self, gitlab_url):
+        path = self.path_for(gitlab_url)
+        with self.condition:
+            while path in self.in_use:
+                self.condition.wait()
+            self.in_use.add(path)
+        return path
+    
+    def release(self, path):
+        path = os.path.abspath(path)
+        if os.path.isdir(path):
+            os.utime(path)
+        
+        with self.condition:
+            self.in_use.discard(path)
+            self.condition.notify_all()
+        
+        self.evict()
+    
+    def evict(self):
+        if self.max_bytes is None:
+            return
+        
+        with self.condition:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                path = os.path.join(self.cache_dir, name)
+                if os.path.isdir(path) and path not in self.in_use:
+                    entries.append((os.path.getmtime(path), path))
+            busy = [path for path in self.in_use if os.path.isdir(path)]
+            self.in_use.update(path for _, path in entries)
+        
+        try:
+            sizes = {path: dir_size(path) for _, path in entries}
+            total = sum(sizes.values()) + sum(dir_size(path) for path in busy)
+            
+            for _, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                subprocess.run(["rm", "-rf", path], check=False)
+                total -= sizes[path]
+                self.evicted += 1
+        finally:
+            with self.condition:
+                self.in_use.difference_update(path for _, path in entries)
+                self.condition.notify_all()
+
+
+class DiskSpaceError(Exception):
+    pass
+
+
+class DiskBudget:
+    def __init__(self, path, reserve_bytes=0, interval=2.0):
+        self.path = os.path.abspath(path)
+        self.reserve_bytes = reserve_bytes
+        self.interval = interval
+        self.reservations = {}
+        self.written = {}
+        self.condition = threading.Condition()
+        self.monitoring = False
+        self.peak_used = 0
+        self.min_free = None
+        self.peak_reserved = 0
+        self.peak_jobs = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        os.makedirs(self.path, exist_ok=True)
+    
+    def free_bytes(self):
+        usage = shutil.disk_usage(self.path)
+        with self.condition:
+            self.peak_used = max(self.peak_used, usage.used)
+            if self.min_free is None or usage.free < self.min_free:
+                self.min_free = usage.free
+        return usage.free
+    
+    def on_disk(self, path):
+        return dir_size(path) if os.path.exists(path) else 0
+    
+    def monitor(self):
+        while True:
+            try:
+                self.free_bytes()
+            except OSError:
+                pass
+            
+            with self.condition:
+                paths = list(self.reservations)
+            written = {path: self.on_disk(path) for path in paths}
+            with self.condition:
+                for path, size in written.items():
+                    if path in self.reservations:
+                        self.written[path] = size
+            time.sleep(self.interval)
+    
+    def start_monitor(self):
+        if not self.monitoring:
+            self.monitoring = True
+            threading.Thread(target=self.monitor, daemon=True).start()
+    
+    def outstanding(self):
+        return sum(max(0, size - self.written.get(path, 0)) for path, size in self.reservations.items())
+    
+    def try_reserve(self, path, size, written=None):
+        if size and written is None:
+            written = self.on_disk(path)
+        
+        with self.condition:
+            if size:
+                needed = max(0, size - written)
+                available = self.free_bytes() - self.outstanding() - self.reserve_bytes
+                if needed > available and not self.reservations:
+                    raise DiskSpaceError(f"Needs about {needed / 1024 ** 2:.0f} MB in {self.path}, but only "
+                                         f"{max(0, available) / 1024 ** 2:.0f} MB are free above the "
+                                         f"{self.reserve_bytes / 1024 ** 3:.1f} GB reserve")
+                if needed > available:
+                    return False
+                self.start_monitor()
+            
+            self.reservations[path] = size or 0
+            self.written[path] = written or 0
+            self.peak_reserved = max(self.peak_reserved, sum(self.reservations.values()))
+            self.peak_jobs = max(self.peak_jobs, len(self.reservations))
+            return True
+    
+    def reserve(self, path, size):
+        written = self.on_disk(path) if size else None
+        if self.try_reserve(path, size, written):
+            return 0.0
+        
+        started = time.monotonic()
+        with self.condition:
+            while not self.try_reserve(path, size, written):
+                self.condition.wait(self.interval)
+        return self.record_wait(started)
+    
+    def record_wait(self, started):
+        waited = time.monotonic() - started
+        with self.condition:
+            self.waits += 1
+            self.wait_seconds += waited
+        return waited
+    
+    def release(self, path):
+        with self.condition:
+            self.written.pop(path, None)
+            if self.reservations.pop(path, None) is not None:
+                self.condition.notify_all()
+    
+    def summary(self):
+        try:
+            self.free_bytes()
+        except OSError:
+            pass
+        
+        text = (f"{self.path}: peak {self.peak_used / 1024 ** 3:.1f} GB used on the filesystem, "
+                f"lowest free {(self.min_free or 0) / 1024 ** 3:.1f} GB, "
+                f"peak {self.peak_reserved / 1024 ** 3:.1f} GB reserved by {self.peak_jobs} mirrors")
+        if self.waits:
+            text += f", {self.waits} clones waited {format_duration(self.wait_seconds)} for space"
+        return text
+
+
+class ImportJournal:
+    STAGES = ["created", "cloned", "pushed", "verified"]
+    
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.stages = {}
+        self.sizes = {}
+        self.partial = False
+        self.lock = threading.Lock()
+        if os.path.exists(path):
+            self.load(resume)
+        self.file = open(path, "a")
+        if self.partial:
+            self.file.write("\n")
+        if not resume:
+            self.write({"restart": True, "time": time.time()})
+    
+    def load(self, resume=True):
+        with open(self.path) as f:
+            for line in f:
+                self.partial = not line.endswith("\n")
+                try:
+                    entry = json.loads(line)
+                    if entry.get("restart"):
+                        self.stages.clear()
+                        continue
+                    key, stage = entry["key"], entry["stage"]
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    continue
+                if resume:
+                    self.stages[key] = stage
+                if entry.get("size"):
+                    self.sizes[key] = entry["size"]
+    
+    def key(self, gitlab_url, repo_name):
+        return f"{gitlab_url} -> {repo_name}"
+    
+    def stage(self, key):
+        with self.lock:
+            return self.stages.get(key)
+    
+    def size(self, key):
+        with self.lock:
+            return self.sizes.get(key)
+    
+    def reached(self, key, stage):
+        current = self.stage(key)
+        return current is not None and self.STAGES.index(current) >= self.STAGES.index(stage)
+    
+    def record(self, key, stage, **details):
+        entry = {"key": key, "stage": stage, "time": time.time()}
+        entry.update(details)
+        with self.lock:
+            self.stages[key] = stage
+            self.write(entry)
+    
+    def write(self, entry):
+        self.file.write(json.dumps(entry) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+    
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+
+class SharedObjectStore:
+    def __init__(self, root, families=None):
+        self.root = os.path.abspath(root)
+        self.families = families or []
+        self.state = {}
+        self.seeded = 0
+        self.referenced = 0
+        self.condition = threading.Condition()
+        self.waiters = {}
+        os.makedirs(self.root, exist_ok=True)
+    
+    def family_for(self, gitlab_url):
+        for pattern, family in self.families:
+            if re.search(pattern, gitlab_url):
+                return family
+        name = gitlab_url.rstrip('/').split('/')[-1]
+        return name[:-4] if name.endswith('.git') else name
+    
+    def path_for(self, family):
+        return os.path.join(self.root, re.sub(r'[^A-Za-z0-9._-]', '_', family) + ".git")
+    
+    def reference_for(self, gitlab_url):
+        family = self.family_for(gitlab_url)
+        path = self.path_for(family)
+        
+        with self.condition:
+            while self.state.get(family) == "seeding":
+                self.condition.wait()
+            return self.claim(family, path)
+    
+    async def reference_for_async(self, gitlab_url):
+        family = self.family_for(gitlab_url)
+        path = self.path_for(family)
+        
+        while True:
+            with self.condition:
+                if self.state.get(family) != "seeding":
+                    return self.claim(family, path)
+                event = asyncio.Event()
+                self.waiters.setdefault(family, []).append((asyncio.get_running_loop(), event))
+            await event.wait()
+    
+    def claim(self, family, path):
+        if self.state.get(family) == "seeded" or os.path.exists(os.path.join(path, "seeded")):
+            self.state[family] = "seeded"
+            self.referenced += 1
+            return path
+        
+        self.state[family] = "seeding"
+        return None
+    
+    def notify(self, family):
+        self.condition.notify_all()
+        for loop, event in self.waiters.pop(family, []):
+            loop.call_soon_threadsafe(event.set)
+    
+    def seed(self, gitlab_url, mirror_dir):
+        family = self.family_for(gitlab_url)
+        path = self.path_for(family)
+        ref_prefix = hashlib.sha1(gitlab_url.encode()).hexdigest()[:16]
+        
+        try:
+            if not os.path.exists(path):
+                subprocess.run(["git", "init", "--quiet", "--bare", path], check=True, capture_output=True)
+            subprocess.run(
+                ["git", "fetch", "--quiet", "--no-tags", os.path.abspath(mirror_dir),
+                 f"+refs/*:refs/seed/{ref_prefix}/*"],
+                cwd=path,
+                check=True,
+                capture_output=True
+            )
+            open(os.path.join(path, "seeded"), "w").close()
+            state = "seeded"
+            self.seeded += 1
+        except (subprocess.CalledProcessError, OSError):
+            state = None
+        
+        with self.condition:
+            self.state[family] = state
+            self.notify(family)
+    
+    def abandon(self, gitlab_url):
+        family = self.family_for(gitlab_url)
+        with self.condition:
+            if self.state.get(family) == "seeding":
+                self.state[family] = None
+                self.notify(family)
+
+
+GITLAB_INTERNAL_REFS = [
+    "refs/merge-requests/*",
+    "refs/keep-around/*",
+    "refs/pipelines/*",
+    "refs/environments/*",
+]
+
+
+GIT_STALL_MARKERS = ("Operation too slow", "curl 28")
+
+TRANSIENT_GIT_ERRORS = (
+    "early EOF",
+    "Connection reset",
+    "Connection timed out",
+    "Could not resolve host",
+    "remote end hung up unexpectedly",
+    "unexpected disconnect",
+    "transfer closed",
+    "Empty reply from server",
+    "RPC failed",
+    "returned error: 5",
+    "gnutls_handshake",
+    "SSL_ERROR_SYSCALL",
+)
+PERMANENT_GIT_ERRORS = (
+    "Authentication failed",
+    "could not read Username",
+    "Repository not found",
+    "Permission denied",
+    "returned error: 4",
+    "RPC failed; HTTP 4",
+    "pre-receive hook declined",
+    "GH001",
+)
+
+LFS_UPLOAD_PROGRESS = re.compile(r"Uploading LFS objects:\s+\d+% \((\d+)/(\d+)\), ([\d.]+) (B|KB|MB|GB|TB)")
+LFS_UNITS = {"B": 1, "KB": 1000, "MB": 1000 ** 2, "GB": 1000 ** 3, "TB": 1000 ** 4}
+
+
+class RefFilter:
+    def __init__(self, include=None, exclude=None):
+        self.include = include or ["refs/*"]
+        self.exclude = list(GITLAB_INTERNAL_REFS) if exclude is None else exclude
+    
+    def matches(self, ref):
+        return (any(fnmatch.fnmatchcase(ref, pattern) for pattern in self.include)
+                and not any(fnmatch.fnmatchcase(ref, pattern) for pattern in self.exclude))
+    
+    def is_everything(self):
+        return self.include == ["refs/*"] and not self.exclude
+    
+    def refspecs(self):
+        return [f"+{pattern}:{pattern}" for pattern in self.include] + [f"^{pattern}" for pattern in self.exclude]
+
+
+class TransferMeter:
+    def __init__(self):
+        self.received = 0
+        self.sent = 0
+        self.started = None
+        self.updated = None
+        self.lock = threading.Lock()
+    
+    def add(self, phase, nbytes):
+        with self.lock:
+            now = time.monotonic()
+            if self.started is None:
+                self.started = now
+            self.updated = now
+            if phase in ("Receiving", "Unpacking"):
+                self.received += nbytes
+            else:
+                self.sent += nbytes
+    
+    def summary(self):
+        wall = max(self.updated - self.started, 1.0)
+        return (f"{self.received / 1024 ** 2:.1f} MB received ({self.received / wall / 1024 ** 2:.2f} MB/s), "
+                f"{self.sent / 1024 ** 2:.1f} MB sent ({self.sent / wall / 1024 ** 2:.2f} MB/s)")
+
+
+class GitProgress:
+    PATTERN = re.compile(r"(Receiving|Unpacking|Writing) objects:\s+(\d+)% \((\d+)/(\d+)\)"
+                         r"(?:, ([\d.]+) (bytes|KiB|MiB|GiB))?(?: \| ([\d.]+) (bytes|KiB|MiB|GiB)/s)?")
+    STEP = re.compile(r"^((?:remote: )?[\w ]+): +\d+%")
+    UNITS = {"bytes": 1, "KiB": 1024, "MiB": 1024 ** 2, "GiB": 1024 ** 3}
+    
+    def __init__(self, meter, log_path=None, redact=None, report=None, interval=30, tail=50):
+        self.meter = meter
+        self.log_file = open(log_path, "a") if log_path else None
+        self.redact = redact
+        self.report = report
+        self.interval = interval
+        self.tail = deque(maxlen=tail)
+        self.buffer = b""
+        self.phase = None
+        self.percent = 0
+        self.done = 0
+        self.total = 0
+        self.bytes = 0
+        self.rate = 0.0
+        self.reported = time.monotonic()
+        self.step = None
+    
+    def write_log(self, line):
+        for secret in self.redact or []:
+            line = line.replace(secret, "***")
+        if self.log_file:
+            self.log_file.write(line + "\n")
+        return line
+    
+    def feed(self, data):
+        self.buffer += data
+        *lines, self.buffer = re.split(rb"[\r\n]", self.buffer)
+        for line in lines:
+            if line:
+                self.handle(line.decode(errors="replace"))
+    
+    def handle(self, line):
+        line = self.write_log(line)
+        step = self.STEP.match(line)
+        if step and self.tail and step.group(1) == self.step:
+            self.tail[-1] = line
+        else:
+            self.tail.append(line)
+        self.step = step.group(1) if step else None
+        
+        match = self.PATTERN.search(line)
+        if not match:
+            return
+        
+        phase, percent, done, total, size, size_unit, rate, rate_unit = match.groups()
+        if phase != self.phase:
+            self.phase = phase
+            self.bytes = 0
+        self.percent, self.done, self.total = int(percent), int(done), int(total)
+        if size:
+            nbytes = int(float(size) * self.UNITS[size_unit])
+            self.meter.add(phase, max(nbytes - self.bytes, 0))
+            self.bytes = nbytes
+        if rate:
+            self.rate = float(rate) * self.UNITS[rate_unit]
+        
+        now = time.monotonic()
+        if self.report and self.interval and now - self.reported >= self.interval:
+            self.reported = now
+            self.report(self.status())
+    
+    def status(self):
+        text = f"{self.phase} objects: {self.percent}% ({self.done}/{self.total})"
+        if self.bytes:
+            text += f", {self.bytes / 1024 ** 2:.1f} MB"
+        if self.rate:
+            text += f" at {self.rate / 1024 ** 2:.2f} MB/s"
+        return text
+    
+    def close(self):
+        if self.buffer:
+            self.handle(self.buffer.decode(errors="replace"))
+            self.buffer = b""
+        if self.log_file:
+            self.log_file.close()
+            self.log_file = None
+    
+    def text(self):
+        return "\n".join(self.tail)
+
 
 class GitLabToGitHub:
-    def __init__(self, github_token, gitlab_base_url="https://gitlab.com", organization=None):
+    API_PREFETCH = 8
+    
+    def __init__(self, github_token, gitlab_base_url="https://gitlab.com", organization=None, jobs=1, engine="threads",
+                 clone_jobs=None, push_jobs=None, queue_size=None, api_rate=10.0, api_timeout=30,
+                 cache_dir=None, cache_max_bytes=None, sync=False, journal_path=None, resume=False,
+                 preflight=False, shared_objects=None, object_families=None, workspace=None,
+                 lean=False, ref_patterns=None, ref_filter=None, max_push_bytes=None, max_blob_bytes=None,
+                 lfs=False, lfs_transfers=8, low_speed_limit=1, low_speed_time=300,
+                 git_timeout=1800, git_timeout_per_gb=900, stall_retries=2, log_dir=None, progress_interval=30,
+                 retry_policy=None, github_tokens=None, github_app=None, largest_first=False,
+                 gitlab_token=None, estimate_rate=10 * 1024 ** 2, work_dir="/tmp", disk_reserve_bytes=0):
         self.github_token = github_token
         self.gitlab_base_url = gitlab_base_url.rstrip('/')
         self.github_api = "https://api.github.com"
         self.organization = organization
+        self.jobs = max(1, int(jobs))
+        self.engine = engine
+        self.clone_jobs = clone_jobs or self.jobs
+        self.push_jobs = push_jobs or self.jobs
+        self.queue_size = queue_size or self.push_jobs
         self.headers = {
             "Authorization": f"token {github_token}",
             "Accept": "application/vnd.github.v3+json"
         }
+        self.token_pool = TokenPool([token for token in [github_token] + list(github_tokens or []) if token], api_rate)
+        self.api_timeout = api_timeout
+        self.api_requests = 0
+        self.aio_connections = 0
+        self._api_lock = threading.Lock()
+        self.session = self.create_session()
+        self.github_app = github_app
+        if github_app:
+            self.token_pool.add(github_app.connect(self.session, api_rate))
+        self.mirror_cache = MirrorCache(cache_dir, cache_max_bytes) if cache_dir else None
+        self.work_dir = work_dir
+        self.disk_budget = DiskBudget(cache_dir or work_dir, disk_reserve_bytes)
+        self.sync = sync
+        self.sync_plans = {}
+        self.journal = ImportJournal(journal_path, resume) if journal_path else None
+        self.preflight = preflight
+        self.repo_metadata = {}
+        self.largest_first = largest_first
+        self.gitlab_token = gitlab_token
+        self.estimate_rate = estimate_rate
+        self.object_store = SharedObjectStore(shared_objects, object_families) if shared_objects else None
+        self.workspace = os.path.abspath(workspace) if workspace else None
+        self.workspace_objects = {}
+        self.lean = lean
+        self.ref_patterns = ref_patterns or []
+        self.ref_filter = ref_filter or RefFilter()
+        self.max_push_bytes = max_push_bytes
+        self.max_blob_bytes = max_blob_bytes
+        self.large_blobs = {}
+        self.lfs = lfs
+        self.lfs_transfers = lfs_transfers
+        self.lfs_stats = {}
+        self.low_speed_limit = low_speed_limit
+        self.low_speed_time = low_speed_time
+        self.git_timeout = git_timeout
+        self.git_timeout_per_gb = git_timeout_per_gb
+        self.stall_retries = stall_retries
+        self.repo_sizes = {}
+        self.stalls = []
+        self._stall_lock = threading.Lock()
+        self.log_dir = log_dir
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+        self.progress_interval = progress_interval
+        self.transfer_meter = TransferMeter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._print_lock = threading.Lock()
+        self.branches = {}
+        self.existing_repos = None
+        self._index_lock = threading.Lock()
+        self._username = None
+        self._owner_lock = threading.Lock()
+        self._owner_lock_async = None
+        self._aio_session = None
+    
+    def log(self, repo_name, message):
+        with self._print_lock:
+            if self.jobs > 1 or self.engine == "pipeline":
+                print(f"[{repo_name}] {message.strip()}")
+            else:
+                print(message)
+    
+    def parse_manifest(self, manifest_path):
+        try:
+            tree = ET.parse(manifest_path)
+            root = tree.getroot()
+            
+            remotes = {}
+            for remote in root.findall('remote'):
+                name = remote.get('name')
+                fetch = remote.get('fetch')
+                remotes[name] = fetch
+            
+            projects = []
+            for project in root.findall('project'):
+                proj_info = {
+                    'path': project.get('path'),
+                    'name': project.get('name'),
+                    'remote': project.get('remote', 'origin'),
+                    'revision': project.get('revision', 'main'),
+                    'upstream': project.get('upstream')
+                }
+                
+                if proj_info['remote'] in remotes:
+                    base_url = remotes[proj_info['remote']]
+                    if not base_url.startswith('http'):
+                        base_url = self.gitlab_base_url
+                    proj_info['gitlab_url'] = f"{base_url}/{proj_info['name']}.git"
+                else:
+                    proj_info['gitlab_url'] = f"{self.gitlab_base_url}/{proj_info['name']}.git"
+                
+                projects.append(proj_info)
+            
+            return projects
+        except Exception as e:
+            print(f"Error parsing manifest: {e}")
+            return []
+    
+    def create_repo_request(self, repo_name, description="", private=False):
+        if self.organization:
+            url = f"{self.github_api}/orgs/{self.organization}/repos"
+        else:
+            url = f"{self.github_api}/user/repos"
+        
+        data = {
+            "name": repo_name,
+            "description": description,
+            "private": private,
+            "auto_init": False
+        }
+        
+        return url, data
+    
+    def handle_create_response(self, repo_name, status_code, body, text):
+        if status_code == 201:
+            self.mark_repo_created(repo_name)
+            return body
+        elif status_code == 422:
+            return self.existing_repo_info(repo_name)
+        else:
+            self.log(repo_name, f"ERROR: Failed to create repo: {status_code} - {text}")
+            return None
+    
+    def api_concurrency(self):
+        return max(self.jobs, self.clone_jobs, self.push_jobs)
+    
+    def api_pool_size(self):
+        return max(self.api_concurrency(), self.API_PREFETCH)
+    
+    def create_session(self):
+        session = requests.Session()
+        session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.api_pool_size(), pool_block=False)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    
+    def connection_stats(self):
+        opened = self.aio_connections
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    opened += pool.num_connections
+        
+        return {
+            "requests": self.api_requests,
+            "connections": opened,
+            "reused": max(self.api_requests - opened, 0),
+        }
+    
+    def api_retry_delay(self, error, failures):
+        delay = self.retry_policy.backoff(failures - 1)
+        print(f"WARNING: GitHub API error ({error}), retrying in {delay:.0f}s "
+              f"({failures}/{self.retry_policy.retries})")
+        return delay
+    
+    def github_request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.api_timeout)
+        attempt = 0
+        failures = 0
+        while True:
+            entry = self.token_pool.acquire()
+            try:
+                wait = entry.limiter.reserve()
+                if wait > 0:
+                    time.sleep(wait)
+                
+                headers = dict(kwargs.get("headers") or {}, Authorization=entry.authorization())
+                response = self.session.request(method, url, **dict(kwargs, headers=headers))
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if failures >= self.retry_policy.retries:
+                    raise
+                failures += 1
+                time.sleep(self.api_retry_delay(f"{type(e).__name__}", failures))
+                continue
+            finally:
+                self.token_pool.release(entry)
+            
+            with self._api_lock:
+                self.api_requests += 1
+            retry_after = entry.limiter.update(response.status_code, response.headers, response.text)
+            
+            if (response.status_code in (401, 403) and retry_after is None
+                    and self.token_pool.disable(entry, response.status_code)):
+                continue
+            if self.retry_policy.is_transient_status(response.status_code) and failures < self.retry_policy.retries:
+                failures += 1
+                time.sleep(self.api_retry_delay(response.status_code, failures))
+                continue
+            if retry_after is None or attempt >= entry.limiter.max_retries:
+                return response
+            
+            attempt += 1
+            print(f"WARNING: GitHub rate limit hit, retrying in {retry_after:.0f}s")
+    
+    def repo_list_url(self):
+        if self.organization:
+            return f"{self.github_api}/orgs/{self.organization}/repos", {"type": "all"}
+        return f"{self.github_api}/user/repos", {"affiliation": "owner"}
+    
+    def build_repo_index(self):
+        url, params = self.repo_list_url()
+        
+        try:
+            names = {repo['name'].lower() for repo in self.paginate(url, params, prefetch=self.API_PREFETCH)}
+        except (GitHubAPIError, requests.RequestException) as e:
+            print(f"WARNING: Could not list existing repositories: {e}")
+            return None
+        
+        self.existing_repos = names
+        print(f"Found {len(self.existing_repos)} existing repositories on GitHub")
+        return self.existing_repos
+    
+    def lookup_repos(self, names, batch_size=100):
+        owner = self.get_owner()
+        if not owner:
+            return None
+        
+        fields = "name defaultBranchRef { name } diskUsage pushedAt"
+        names = list(dict.fromkeys(names))
+        found = {}
+        for start in range(0, len(names), batch_size):
+            batch = names[start:start + batch_size]
+            variables = {"owner": owner}
+            declarations = ["$owner: String!"]
+            aliases = []
+            for i, name in enumerate(batch):
+                variables[f"n{i}"] = name
+                declarations.append(f"$n{i}: String!")
+                aliases.append(f"r{i}: repository(owner: $owner, name: $n{i}) {{ {fields} }}")
+            query = f"query({', '.join(declarations)}) {{ {' '.join(aliases)} }}"
+            
+            try:
+                response = self.github_request("POST", f"{self.github_api}/graphql",
+                                               json={"query": query, "variables": variables})
+                body = response.json() if response.status_code == 200 else None
+            except (requests.RequestException, ValueError) as e:
+                print(f"WARNING: Could not look up target repositories: {e}")
+                return None
+            
+            if not body or body.get("data") is None:
+                print(f"WARNING: Could not look up target repositories: {response.status_code} - {response.text}")
+                return None
+            errors = [error for error in body.get("errors") or [] if error.get("type") != "NOT_FOUND"]
+            if errors:
+                print(f"WARNING: Could not look up target repositories: {errors[0].get('message')}")
+                return None
+            
+            for i, name in enumerate(batch):
+                repo = body["data"].get(f"r{i}")
+                if repo:
+                    found[name.lower()] = {
+                        "name": repo["name"],
+                        "default_branch": (repo["defaultBranchRef"] or {}).get("name"),
+                        "size_kb": repo["diskUsage"] or 0,
+                        "pushed_at": repo["pushedAt"],
+                    }
+        
+        self.repo_metadata = found
+        self.existing_repos = set(found)
+        print(f"Looked up {len(names)} target repositories: {len(found)} already exist")
+        return found
+    
+    def repo_exists(self, repo_name):
+        if self.existing_repos is None:
+            return None
+        with self._index_lock:
+            return repo_name.lower() in self.existing_repos
+    
+    def mark_repo_created(self, repo_name):
+        if self.existing_repos is not None:
+            with self._index_lock:
+                self.existing_repos.add(repo_name.lower())
+    
+    def existing_repo_info(self, repo_name):
+        owner = self.organization if self.organization else "<username>"
+        info = self.repo_metadata.get(repo_name.lower())
+        if info:
+            self.log(repo_name, f"WARNING: Repository '{repo_name}' already exists "
+                                f"(default branch {info['default_branch'] or 'none'}, "
+                                f"{info['size_kb'] / 1024:.1f} MB, last push {info['pushed_at'] or 'never'})")
+        else:
+            self.log(repo_name, f"WARNING: Repository '{repo_name}' already exists")
+        return {"full_name": f"{owner}/{repo_name}"}
+    
+    def get_page(self, url, params=None):
+        response = self.github_request("GET", url, params=params)
+        if response.status_code != 200:
+            raise GitHubAPIError(response)
+        return response
+    
+    def page_number(self, response, rel):
+        link = response.links.get(rel, {}).get("url")
+        if not link:
+            return None
+        page = parse_qs(urlparse(link).query).get("page")
+        return int(page[0]) if page else None
+    
+    def paginate(self, url, params=None, prefetch=1):
+        params = dict(params or {}, per_page=100)
+        response = self.get_page(url, params)
+        last_page = self.page_number(response, "last")
+        
+        if prefetch < 1:
+            while True:
+                yield from response.json()
+                next_url = response.links.get("next", {}).get("url")
+                if not next_url:
+                    return
+                response = self.get_page(next_url)
+        
+        with ThreadPoolExecutor(max_workers=prefetch) as executor:
+            if last_page and self.page_number(response, "next") == 2:
+                pending = deque()
+                next_page = 2
+                while True:
+                    while next_page <= last_page and len(pending) < prefetch:
+                        pending.append(executor.submit(self.get_page, url, dict(params, page=next_page)))
+                        next_page += 1
+                    yield from response.json()
+                    if not pending:
+                        return
+                    response = pending.popleft().result()
+            else:
+                while True:
+                    next_url = response.links.get("next", {}).get("url")
+                    future = executor.submit(self.get_page, next_url) if next_url else None
+                    yield from response.json()
+                    if future is None:
+                        return
+                    response = future.result()
+    
+    def create_github_repo(self, repo_name, description="", private=False):
+        if self.repo_exists(repo_name):
+            return self.existing_repo_info(repo_name)
+        
+        url, data = self.create_repo_request(repo_name, description, private)
+        response = self.github_request("POST", url, json=data)
+        body = response.json() if response.status_code == 201 else None
+        
+        return self.handle_create_response(repo_name, response.status_code, body, response.text)
+    
+    def get_github_username(self):
+        url = f"{self.github_api}/user"
+        response = self.github_request("GET", url)
+        
+        if response.status_code == 200:
+            return response.json()['login']
+        return None
+    
+    def get_user_organizations(self):
+        url = f"{self.github_api}/user/orgs"
+        
+        try:
+            return [org['login'] for org in self.paginate(url)]
+        except GitHubAPIError:
+            return []
+    
+    def get_owner(self):
+        if self.organization:
+            return self.organization
+        
+        with self._owner_lock:
+            if not self._username:
+                self._username = self.get_github_username()
+            return self._username
+    
+    def github_push_url(self, owner, repo_name):
+        return f"https://{self.token_pool.push_credential()}@github.com/{owner}/{repo_name}.git"
+    
+    def temp_dir_for(self, gitlab_url, repo_name):
+        digest = hashlib.sha1(gitlab_url.encode()).hexdigest()[:8]
+        return os.path.join(self.work_dir, f"gitlab_import_{repo_name}-{digest}")
+    
+    def acquire_mirror(self, gitlab_url, repo_name):
+        if self.mirror_cache:
+            return self.mirror_cache.acquire(f"{gitlab_url}#lean" if self.lean else gitlab_url)
+        return self.temp_dir_for(gitlab_url, repo_name)
+    
+    def is_incremental(self, mirror_dir):
+        return (self.mirror_cache is not None and self.mirror_cache.owns(mirror_dir)
+                and os.path.exists(os.path.join(mirror_dir, "HEAD")))
+    
+    def project_branch(self, proj):
+        revision = proj['revision']
+        if re.fullmatch(r'[0-9a-f]{40}', revision) and proj.get('upstream'):
+            return proj['upstream']
+        return revision
+    
+    def lean_branch(self, gitlab_url):
+        if not self.lean:
+            return None
+        
+        branch = self.branches.get(gitlab_url)
+        if not branch or re.fullmatch(r'[0-9a-f]{40}', branch):
+            return None
+        for prefix in ("refs/heads/", "refs/tags/"):
+            if branch.startswith(prefix):
+                return branch[len(prefix):]
+        return branch
+    
+    def ref_selected(self, gitlab_url, ref):
+        branch = self.lean_branch(gitlab_url)
+        if branch is None:
+            return self.ref_filter.matches(ref)
+        if ref in (f"refs/heads/{branch}", f"refs/tags/{branch}"):
+            return True
+        return any(fnmatch.fnmatchcase(ref, pattern) for pattern in self.ref_patterns)
+    
+    def configure_fetch(self, mirror_dir):
+        subprocess.run(["git", "config", "--unset-all", "remote.origin.fetch"], cwd=mirror_dir, capture_output=True)
+        for refspec in self.ref_filter.refspecs():
+            subprocess.run(["git", "config", "--add", "remote.origin.fetch", refspec],
+                           cwd=mirror_dir, check=True, capture_output=True)
+    
+    def init_filtered_mirror(self, gitlab_url, temp_dir, references):
+        subprocess.run(["git", "init", "--quiet", "--bare", temp_dir], check=True, capture_output=True)
+        subprocess.run(["git", "config", "remote.origin.url", gitlab_url], cwd=temp_dir, check=True, capture_output=True)
+        subprocess.run(["git", "config", "remote.origin.mirror", "true"], cwd=temp_dir, check=True, capture_output=True)
+        self.configure_fetch(temp_dir)
+        
+        if references:
+            with open(os.path.join(temp_dir, "objects", "info", "alternates"), "w") as f:
+                for reference in references:
+                    objects = os.path.join(reference, "objects")
+                    if not os.path.isdir(objects):
+                        objects = os.path.join(reference, ".git", "objects")
+                    f.write(objects + "\n")
+    
+    def prepare_clone(self, gitlab_url, temp_dir, reference=None):
+        references = [reference] if reference else []
+        if gitlab_url in self.workspace_objects:
+            references.append(self.workspace_objects[gitlab_url])
+        reference_args = [arg for path in references for arg in ("--reference", path)]
+        
+        branch = self.lean_branch(gitlab_url)
+        if branch is None:
+            if self.ref_filter.is_everything():
+                return [(["git", "clone", "--mirror"] + reference_args + [gitlab_url, temp_dir], None)]
+            
+            self.init_filtered_mirror(gitlab_url, temp_dir, references)
+            return [(["git", "fetch", "--prune", "origin"], temp_dir)]
+        
+        commands = [(["git", "clone", "--bare", "--single-branch", "--branch", branch]
+                     + reference_args + [gitlab_url, temp_dir], None)]
+        for pattern in self.ref_patterns:
+            commands.append((["git", "config", "--add", "remote.origin.fetch", f"+{pattern}:{pattern}"], temp_dir))
+        if self.ref_patterns:
+            commands.append((["git", "fetch", "origin"], temp_dir))
+        return commands
+    
+    def find_workspace_objects(self, proj):
+        candidates = [
+            os.path.join(self.workspace, ".repo", "project-objects", f"{proj['name']}.git"),
+        ]
+        if proj.get('path'):
+            candidates += [
+                os.path.join(self.workspace, ".repo", "projects", f"{proj['path']}.git"),
+                os.path.join(self.workspace, proj['path'], ".git"),
+            ]
+        
+        for candidate in candidates:
+            if os.path.isdir(os.path.join(candidate, "objects")):
+                return os.path.realpath(candidate)
+        return None
+    
+    def scan_workspace(self, projects):
+        print(f"\nLooking up local objects in workspace {self.workspace}...")
+        for proj in projects:
+            local = self.find_workspace_objects(proj)
+            if local:
+                self.workspace_objects[proj['gitlab_url']] = local
+        print(f"   Found local objects for {len(self.workspace_objects)} of {len(projects)} projects")
+    
+    def update_command(self):
+        return ["git", "fetch", "--prune", "origin"]
+    
+    def push_command(self, github_url):
+        if self.ref_filter.is_everything():
+            return ["git", "push", "--mirror", github_url]
+        return ["git", "push", "--prune", "--force", github_url] + self.ref_filter.refspecs()
+    
+    def push_commands(self, github_repo_name, github_url, gitlab_url=None, batch_size=500):
+        plan = self.sync_plans.get(github_repo_name)
+        if not plan:
+            if self.lean_branch(gitlab_url) is not None:
+                refspecs = ["+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*"]
+                refspecs += [f"+{pattern}:{pattern}" for pattern in self.ref_patterns]
+                return [["git", "push", "--force", github_url] + refspecs]
+            return [self.push_command(github_url)]
+        
+        updates, deletions = plan
+        refspecs = [f"+{ref}:{ref}" for ref in sorted(updates)] + [f":{ref}" for ref in sorted(deletions)]
+        return [["git", "push", "--force", github_url] + refspecs[i:i + batch_size]
+                for i in range(0, len(refspecs), batch_size)]
+    
+    def network_git(self, command):
+        command = self.token_pool.refresh_args(command)
+        if command[0] != "git" or not self.low_speed_limit:
+            return command
+        return ["git", "-c", f"http.lowSpeedLimit={self.low_speed_limit}",
+                "-c", f"http.lowSpeedTime={self.low_speed_time}"] + command[1:]
+    
+    def git_timeout_for(self, size=0):
+        if not self.git_timeout or not size:
+            return None
+        return self.git_timeout + self.git_timeout_per_gb * size / 1024 ** 3
+    
+    def estimated_size(self, gitlab_url, mirror_dir):
+        if gitlab_url in self.repo_sizes:
+            return self.repo_sizes[gitlab_url]
+        return dir_size(mirror_dir) if os.path.exists(mirror_dir) else 0
+    
+    def record_stall(self, github_repo_name, operation, kind, attempt):
+        with self._stall_lock:
+            self.stalls.append({"repo": github_repo_name, "operation": operation, "kind": kind})
+        
+        if attempt < self.stall_retries:
+            self.log(github_repo_name, f"   WARNING: {operation} stalled ({kind}), "
+                                       f"retrying ({attempt + 1}/{self.stall_retries})...")
+        else:
+            self.log(github_repo_name, f"   WARNING: {operation} stalled ({kind}), giving up")
+    
+    def prepare_retry(self, command):
+        if command[1] == "clone":
+            shutil.rmtree(command[-1], ignore_errors=True)
+    
+    def progress_command(self, command):
+        if command[0] == "git" and command[1] in ("clone", "fetch", "push"):
+            return command[:2] + ["--progress"] + command[2:]
+        return command
+    
+    def open_progress(self, github_repo_name, command):
+        log_path = os.path.join(self.log_dir, f"{github_repo_name}.log") if self.log_dir else None
+        progress = GitProgress(self.transfer_meter, log_path, self.token_pool.secrets(),
+                               lambda status: self.log(github_repo_name, f"   {status}"), self.progress_interval)
+        progress.write_log(f"$ {' '.join(command)}")
+        return progress
+    
+    def pump_progress(self, stream, progress):
+        for data in iter(lambda: stream.read1(65536), b""):
+            progress.feed(data)
+    
+    def classify_git_failure(self, returncode, output):
+        if returncode is None:
+            return "timeout"
+        if returncode == 0:
+            return None
+        if any(marker in output for marker in GIT_STALL_MARKERS):
+            return "too slow"
+        if self.retry_policy.is_transient_git(output):
+            return "transient"
+        return None
+    
+    def git_retry_delay(self, github_repo_name, operation, failures):
+        delay = self.retry_policy.backoff(failures - 1)
+        self.log(github_repo_name, f"   WARNING: {operation} hit a transient error, retrying in {delay:.0f}s "
+                                   f"({failures}/{self.retry_policy.retries})...")
+        return delay
+    
+    def run_git(self, github_repo_name, operation, command, cwd=None, size=0):
+        timeout = self.git_timeout_for(size)
+        stalls = failures = 0
+        while True:
+            process = subprocess.Popen(
+                self.network_git(self.progress_command(command)),
+                cwd=cwd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                start_new_session=True
+            )
+            progress = self.open_progress(github_repo_name, command)
+            reader = threading.Thread(target=self.pump_progress, args=(process.stdout, progress), daemon=True)
+            reader.start()
+            try:
+                returncode = process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                kill_process_group(process.pid)
+                process.wait()
+                returncode = None
+            except BaseException:
+                kill_process_group(process.pid)
+                raise
+            finally:
+                reader.join()
+                progress.close()
+            
+            if returncode is None:
+                result = subprocess.CompletedProcess(command, -9, "", f"{progress.text()}\nkilled after {timeout:.0f}s")
+            else:
+                result = subprocess.CompletedProcess(command, returncode, "", progress.text())
+            
+            failure = self.classify_git_failure(returncode, result.stderr)
+            if failure in ("timeout", "too slow"):
+                self.record_stall(github_repo_name, operation, failure, stalls)
+                if stalls >= self.stall_retries:
+                    return result
+                stalls += 1
+            elif failure == "transient" and failures < self.retry_policy.retries:
+                failures += 1
+                time.sleep(self.git_retry_delay(github_repo_name, operation, failures))
+            else:
+                return result
+            self.prepare_retry(command)
+    
+    def ls_remote(self, url):
+        for attempt in range(self.retry_policy.retries + 1):
+            try:
+                result = subprocess.run(
+                    self.network_git(["git", "ls-remote", url]),
+                    capture_output=True,
+                    text=True,
+                    timeout=self.git_timeout or None
+                )
+            except subprocess.TimeoutExpired:
+                return None
+            
+            if result.returncode == 0 or not self.retry_policy.is_transient_git(result.stderr):
+                break
+            if attempt < self.retry_policy.retries:
+                time.sleep(self.retry_policy.backoff(attempt))
+        
+        if result.returncode != 0:
+            return None
+        
+        refs = {}
+        for line in result.stdout.splitlines():
+            sha, _, ref = line.partition("\t")
+            if ref.startswith("refs/") and not ref.endswith("^{}") and not ref.startswith("refs/pull/"):
+                refs[ref] = sha
+        return refs
+    
+    def compare_refs(self, gitlab_url, github_repo_name):
+        if self.repo_exists(github_repo_name) is False:
+            return None
+        
+        owner = self.get_owner()
+        source = self.ls_remote(gitlab_url)
+        target = self.ls_remote(self.github_push_url(owner, github_repo_name)) if owner else None
+        
+        if source is None or target is None:
+            return None
+        
+        lean = self.lean_branch(gitlab_url) is not None
+        source = {ref: sha for ref, sha in source.items()
+                  if self.ref_selected(gitlab_url, ref) or (lean and ref.startswith("refs/tags/") and ref in target)}
+        managed = {ref: sha for ref, sha in target.items() if self.ref_selected(gitlab_url, ref)}
+        
+        updates = {ref: sha for ref, sha in source.items() if target.get(ref) != sha}
+        deletions = [ref for ref in managed if ref not in source]
+        return updates, deletions
+    
+    def plan_sync(self, projects, prefix="", custom_names=None):
+        print("\nComparing GitLab and GitHub refs...")
+        names = [self.target_repo_name(proj, prefix, custom_names) for proj in projects]
+        
+        with ThreadPoolExecutor(max_workers=self.api_pool_size()) as executor:
+            plans = executor.map(lambda item: self.compare_refs(item[0]['gitlab_url'], item[1]),
+                                 zip(projects, names))
+            for repo_name, plan in zip(names, plans):
+                if plan is not None:
+                    self.sync_plans[repo_name] = plan
+        
+        up_to_date = sum(1 for plan in self.sync_plans.values() if self.is_up_to_date_plan(plan))
+        changed = len(self.sync_plans) - up_to_date
+        print(f"   Up to date: {up_to_date}, changed: {changed}, full import: {len(projects) - len(self.sync_plans)}")
+    
+    def is_up_to_date_plan(self, plan):
+        updates, deletions = plan
+        return not updates and not deletions
+    
+    def is_up_to_date(self, github_repo_name):
+        plan = self.sync_plans.get(github_repo_name)
+        return plan is not None and self.is_up_to_date_plan(plan)
+    
+    def journal_key(self, gitlab_url, github_repo_name):
+        return self.journal.key(gitlab_url, github_repo_name) if self.journal else None
+    
+    def journal_reached(self, gitlab_url, github_repo_name, stage):
+        return self.journal is not None and self.journal.reached(self.journal_key(gitlab_url, github_repo_name), stage)
+    
+    def record_stage(self, gitlab_url, github_repo_name, stage, **details):
+        if self.journal:
+            self.journal.record(self.journal_key(gitlab_url, github_repo_name), stage, **details)
+    
+    def skip_reason(self, gitlab_url, github_repo_name):
+        if self.journal_reached(gitlab_url, github_repo_name, "verified"):
+            return "already imported"
+        if self.is_up_to_date(github_repo_name):
+            return "up to date"
+        return None
+    
+    def local_refs(self, mirror_dir):
+        result = subprocess.run(
+            ["git", "for-each-ref", "--format=%(objectname)%09%(refname)"],
+            cwd=mirror_dir,
+            capture_output=True,
+            text=True
+        )
+        
+        if result.returncode != 0:
+            return None
+        
+        refs = {}
+        for line in result.stdout.splitlines():
+            sha, _, ref = line.partition("\t")
+            if not ref.startswith("refs/pull/"):
+                refs[ref] = sha
+        return refs
+    
+    def verify_import(self, gitlab_url, github_repo_name, github_url, mirror_dir=None):
+        if not self.journal:
+            return True
+        
+        if mirror_dir and os.path.exists(os.path.join(mirror_dir, "HEAD")):
+            expected = self.local_refs(mirror_dir)
+        else:
+            expected = self.ls_remote(gitlab_url)
+        if expected is not None:
+            expected = {ref: sha for ref, sha in expected.items() if self.ref_selected(gitlab_url, ref)}
+        actual = self.ls_remote(github_url)
+        
+        if expected is None or actual is None or any(actual.get(ref) != sha for ref, sha in expected.items()):
+            self.log(github_repo_name, f"   ERROR: Verification failed: GitHub refs do not match the source")
+            return False
+        
+        self.record_stage(gitlab_url, github_repo_name, "verified", refs=len(actual))
+        return True
+    
+    def prepare_target(self, github_repo_name, gitlab_url=None):
+        owner = self.get_owner()
+        if not owner:
+            self.log(github_repo_name, "ERROR: Failed to get GitHub username")
+            return None
+        
+        if self.organization:
+            self.log(github_repo_name, f"   Target: Organization '{owner}'")
+        else:
+            self.log(github_repo_name, f"   Target: User '{owner}'")
+        
+        if not self.journal_reached(gitlab_url, github_repo_name, "created"):
+            repo_info = self.create_github_repo(github_repo_name)
+            if not repo_info:
+                return None
+            self.record_stage(gitlab_url, github_repo_name, "created")
+        
+        return self.github_push_url(owner, github_repo_name)
+    
+    def can_reuse_mirror(self, gitlab_url, github_repo_name, mirror_dir):
+        return (self.is_incremental(mirror_dir) or
+                (self.journal_reached(gitlab_url, github_repo_name, "cloned")
+                 and os.path.exists(os.path.join(mirror_dir, "HEAD"))))
+    
+    def log_clone_start(self, gitlab_url, github_repo_name, reference=None):
+        if self.lean and self.lean_branch(gitlab_url) is None:
+            self.log(github_repo_name, f"   WARNING: Revision '{self.branches.get(gitlab_url)}' is not a branch "
+                                       f"or tag, mirroring all refs")
+        
+        sources = []
+        if reference:
+            sources.append(f"objects shared with {os.path.basename(reference)}")
+        if gitlab_url in self.workspace_objects:
+            sources.append("local workspace objects")
+        
+        if sources:
+            self.log(github_repo_name, f"   Cloning from GitLab ({', '.join(sources)})...")
+        else:
+            self.log(github_repo_name, f"   Cloning from GitLab...")
+    
+    def reserve_disk(self, gitlab_url, github_repo_name, mirror_dir):
+        waited = self.disk_budget.reserve(mirror_dir, self.estimated_size(gitlab_url, mirror_dir))
+        if waited >= 1:
+            self.log(github_repo_name, f"   Waited {format_duration(waited)} for disk space")
+    
+    def clone_mirror(self, gitlab_url, github_repo_name, mirror_dir):
+        self.reserve_disk(gitlab_url, github_repo_name, mirror_dir)
+        if self.can_reuse_mirror(gitlab_url, github_repo_name, mirror_dir):
+            self.log(github_repo_name, f"   Updating existing mirror from GitLab...")
+            if self.lean_branch(gitlab_url) is None:
+                self.configure_fetch(mirror_dir)
+            result = self.run_git(github_repo_name, "Fetch", self.update_command(), mirror_dir,
+                                  self.estimated_size(gitlab_url, mirror_dir))
+            
+            if result.returncode == 0:
+                return self.finish_clone(gitlab_url, github_repo_name, mirror_dir)
+            self.log(github_repo_name, f"   WARNING: Mirror update failed, cloning again: {result.stderr}")
+        
+        if os.path.exists(mirror_dir):
+            subprocess.run(["rm", "-rf", mirror_dir], check=True)
+        
+        reference = self.object_store.reference_for(gitlab_url) if self.object_store else None
+        self.log_clone_start(gitlab_url, github_repo_name, reference)
+        
+        try:
+            size = self.repo_sizes.get(gitlab_url, 0)
+            for command, cwd in self.prepare_clone(gitlab_url, mirror_dir, reference):
+                result = self.run_git(github_repo_name, "Clone", command, cwd, size)
+                if result.returncode != 0:
+                    break
+        except Exception:
+            if self.object_store and not reference:
+                self.object_store.abandon(gitlab_url)
+            raise
+        
+        if result.returncode != 0:
+            if self.object_store and not reference:
+                self.object_store.abandon(gitlab_url)
+            self.log(github_repo_name, f"   ERROR: Clone failed: {result.stderr}")
+            return False
+        
+        if self.object_store and not reference:
+            self.object_store.seed(gitlab_url, mirror_dir)
+        
+        return self.finish_clone(gitlab_url, github_repo_name, mirror_dir)
+    
+    def dissociate(self, github_repo_name, mirror_dir):
+        alternates = os.path.join(mirror_dir, "objects", "info", "alternates")
+        if not os.path.exists(alternates):
+            return True
+        
+        self.log(github_repo_name, f"   Copying borrowed objects into the cached mirror...")
+        result = subprocess.run(["git", "repack", "-a", "-d", "--quiet"], cwd=mirror_dir,
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            self.log(github_repo_name, f"   ERROR: Could not detach mirror from its alternates: {result.stderr}")
+            return False
+        os.remove(alternates)
+        return True
+    
+    def finish_clone(self, gitlab_url, github_repo_name, mirror_dir):
+        if self.mirror_cache and self.mirror_cache.owns(mirror_dir):
+            if not self.dissociate(github_repo_name, mirror_dir):
+                return False
+        
+        size = dir_size(mirror_dir)
+        self.repo_sizes[gitlab_url] = size
+        self.record_stage(gitlab_url, github_repo_name, "cloned", mirror=mirror_dir, size=size)
+        return True
+    
+    def lfs_objects(self, mirror_dir):
+        output = self.git_output(["lfs", "ls-files", "--all", "--json"], mirror_dir)
+        if output is None:
+            return None
+        files = json.loads(output or "{}").get("files") or []
+        return {entry["oid"]: entry["size"] for entry in files}
+    
+    def transfer_lfs(self, github_repo_name, mirror_dir, github_url):
+        if not self.lfs:
+            return True
+        
+        objects = self.lfs_objects(mirror_dir)
+        if objects is None:
+            self.log(github_repo_name, f"   ERROR: Could not list LFS objects")
+            return False
+        if not objects:
+            return True
+        
+        total_bytes = sum(objects.values())
+        self.log(github_repo_name, f"   Transferring {len(objects)} LFS objects "
+                                   f"({total_bytes / 1024 ** 2:.1f} MB)...")
+        
+        store = os.path.join(mirror_dir, "lfs", "objects")
+        before = dir_size(store)
+        lfs = ["git", "-c", f"lfs.concurrenttransfers={self.lfs_transfers}", "-c", "lfs.forceprogress=true", "lfs"]
+        for command in (lfs + ["fetch", "--all", "origin"], lfs + ["push", "--all", github_url]):
+            result = self.run_git(github_repo_name, "LFS transfer", command, mirror_dir, total_bytes)
+            
+            if result.returncode != 0:
+                self.log(github_repo_name, f"   ERROR: LFS transfer failed: {result.stderr}")
+                return False
+        
+        uploaded, uploaded_bytes = 0, 0
+        for match in LFS_UPLOAD_PROGRESS.finditer(result.stderr):
+            uploaded = int(match.group(1))
+            uploaded_bytes = int(float(match.group(3)) * LFS_UNITS[match.group(4)])
+        fetched_bytes = dir_size(store) - before
+        
+        self.lfs_stats[github_repo_name] = {
+            "objects": len(objects),
+            "fetched_bytes": fetched_bytes,
+            "uploaded": uploaded,
+            "uploaded_bytes": uploaded_bytes,
+        }
+        self.log(github_repo_name, f"   LFS: {fetched_bytes / 1024 ** 2:.1f} MB fetched, "
+                                   f"{uploaded} objects ({uploaded_bytes / 1024 ** 2:.1f} MB) uploaded, "
+                                   f"{len(objects) - uploaded} already on GitHub")
+        return True
+    
+    def selected_local_refs(self, gitlab_url, mirror_dir):
+        return {ref: sha for ref, sha in (self.local_refs(mirror_dir) or {}).items()
+                if self.ref_selected(gitlab_url, ref)}
+    
+    def git_output(self, args, cwd, input=None):
+        result = subprocess.run(
+            ["git"] + args,
+            cwd=cwd,
+            input=input,
+            capture_output=True,
+            text=True
+        )
+        
+        if result.returncode != 0:
+            return None
+        return result.stdout
+    
+    def pending_push_size(self, mirror_dir, include, exclude):
+        revs = "".join(f"{rev}\n" for rev in include) + "".join(f"^{rev}\n" for rev in exclude)
+        output = self.git_output(["rev-list", "--objects", "--disk-usage", "--stdin"], mirror_dir, revs)
+        return int(output.strip()) if output is not None else None
+    
+    def known_remote_tips(self, mirror_dir, remote_refs):
+        if not remote_refs:
+            return set()
+        
+        shas = "".join(f"{sha}\n" for sha in set(remote_refs.values()))
+        output = self.git_output(["cat-file", "--batch-check=%(objectname) %(objecttype)"], mirror_dir, shas) or ""
+        return {line.split()[0] for line in output.splitlines() if not line.endswith(" missing")}
+    
+    def needs_chunked_push(self, mirror_dir):
+        if not self.max_push_bytes:
+            return False
+        if os.path.exists(os.path.join(mirror_dir, "objects", "info", "alternates")):
+            return True
+        
+        output = self.git_output(["count-objects", "-v"], mirror_dir) or ""
+        stats = dict(line.split(": ", 1) for line in output.splitlines() if ": " in line)
+        local_bytes = (int(stats.get("size-pack", 0)) + int(stats.get("size", 0))) * 1024
+        return local_bytes > self.max_push_bytes
     
-    def parse_manifest(self, manifest_path):
-        try:
-            tree = ET.parse(manifest_path)
-            root = tree.getroot()
-            
-            remotes = {}
-            for remote in root.findall('remote'):
-                name = remote.get('name')
-                fetch = remote.get('fetch')
-                remotes[name] = fetch
+    def push_in_chunks(self, github_repo_name, mirror_dir, github_url, gitlab_url=None):
+        limit = self.max_push_bytes
+        tips = self.known_remote_tips(mirror_dir, self.ls_remote(github_url) or {})
+        local = self.selected_local_refs(gitlab_url, mirror_dir)
+        
+        total = self.pending_push_size(mirror_dir, local.values(), tips)
+        if total is None:
+            self.log(github_repo_name, f"   ERROR: Could not measure the push size (git rev-list --disk-usage "
+                                       f"needs Git 2.31+); use --max-push-mb 0 to push without splitting")
+            return False
+        if total <= limit:
+            return True
+        
+        self.log(github_repo_name, f"   Push of ~{total / 1024 ** 2:.0f} MB exceeds {limit / 1024 ** 2:.0f} MB, "
+                                   f"pushing history in chunks...")
+        chunks = 0
+        for ref in sorted(ref for ref in local if ref.startswith("refs/heads/")):
+            revs = f"{local[ref]}\n" + "".join(f"^{tip}\n" for tip in tips)
+            output = self.git_output(["rev-list", "--first-parent", "--reverse", "--stdin"], mirror_dir, revs)
+            commits = output.split() if output else []
+            if not commits:
+                continue
             
-            projects = []
-            for project in root.findall('project'):
-                proj_info = {
-                    'path': project.get('path'),
-                    'name': project.get('name'),
-                    'remote': project.get('remote', 'origin'),
-                    'revision': project.get('revision', 'main')
-                }
+            position = -1
+            step = max(1, int(len(commits) * limit * 0.8 / total))
+            while position < len(commits) - 1:
+                candidate = min(position + step, len(commits) - 1)
+                size = self.pending_push_size(mirror_dir, [commits[candidate]], tips)
+                if size is None:
+                    self.log(github_repo_name, f"   ERROR: Could not measure the size of the next chunk of {ref}")
+                    return False
+                if size > limit and candidate > position + 1:
+                    step = max(1, (candidate - position) // 2)
+                    continue
                 
-                if proj_info['remote'] in remotes:
-                    base_url = remotes[proj_info['remote']]
-                    if not base_url.startswith('http'):
-                        base_url = self.gitlab_base_url
-                    proj_info['gitlab_url'] = f"{base_url}/{proj_info['name']}.git"
-                else:
-                    proj_info['gitlab_url'] = f"{self.gitlab_base_url}/{proj_info['name']}.git"
+                result = self.run_git(github_repo_name, "Push",
+                                      ["git", "push", "--force", github_url, f"{commits[candidate]}:{ref}"],
+                                      mirror_dir, size)
+                if result.returncode != 0:
+                    self.log(github_repo_name, f"   ERROR: Chunk push of {ref} failed "
+                                               f"({chunks} chunks pushed so far): {result.stderr}")
+                    return False
                 
-                projects.append(proj_info)
-            
-            return projects
-        except Exception as e:
-            print(f"Error parsing manifest: {e}")
-            return []
+                chunks += 1
+                tips.add(commits[candidate])
+                position = candidate
+                self.log(github_repo_name, f"   Chunk {chunks}: {ref} at {position + 1}/{len(commits)} commits "
+                                           f"(~{size / 1024 ** 2:.0f} MB)")
+                if size < limit / 2:
+                    step *= 2
+        
+        return True
     
-    def create_github_repo(self, repo_name, description="", private=False):
-        if self.organization:
-            url = f"{self.github_api}/orgs/{self.organization}/repos"
-        else:
-            url = f"{self.github_api}/user/repos"
+    def find_large_blobs(self, mirror_dir, refs):
+        revs = "".join(f"{sha}\n" for sha in set(refs.values()))
+        process = subprocess.Popen(
+            ["git", "rev-list", "--objects", "--no-object-names", f"--filter=blob:limit={self.max_blob_bytes + 1}",
+             "--filter-print-omitted", "--stdin"],
+            cwd=mirror_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True
+        )
+        try:
+            process.stdin.write(revs)
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
         
-        data = {
-            "name": repo_name,
-            "description": description,
-            "private": private,
-            "auto_init": False
-        }
+        omitted = [line[1:] for line in process.stdout if line.startswith("~")]
+        if process.wait() != 0:
+            return None
+        if not omitted:
+            return {}
         
-        response = requests.post(url, headers=self.headers, json=data)
+        output = self.git_output(["cat-file", "--batch-check=%(objectname) %(objectsize)"], mirror_dir, "".join(omitted))
+        if output is None:
+            return None
+        return {sha: int(size) for sha, size in (line.split() for line in output.splitlines())}
+    
+    def locate_blobs(self, mirror_dir, blobs, refs):
+        revs = "".join(f"{sha}\n" for sha in set(refs.values()))
+        process = subprocess.Popen(
+            ["git", "rev-list", "--objects", "--stdin"],
+            cwd=mirror_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True
+        )
+        try:
+            process.stdin.write(revs)
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
         
-        if response.status_code == 201:
-            return response.json()
-        elif response.status_code == 422:
-            owner = self.organization if self.organization else "<username>"
-            print(f"WARNING: Repository '{repo_name}' already exists")
-            return {"full_name": f"{owner}/{repo_name}"}
-        else:
-            print(f"ERROR: Failed to create repo: {response.status_code} - {response.text}")
+        paths = {}
+        for line in process.stdout:
+            sha, _, path = line.rstrip("\n").partition(" ")
+            if sha in blobs and sha not in paths:
+                paths[sha] = path
+        if process.wait() != 0:
             return None
+        
+        located = []
+        for sha, path in paths.items():
+            output = self.git_output(["log", "--format=%H", f"--find-object={sha}", "--stdin"], mirror_dir, revs) or ""
+            located.append((sha, blobs[sha], path, output.split()[:3]))
+        return sorted(located, key=lambda blob: -blob[1])
     
-    def get_github_username(self):
-        url = f"{self.github_api}/user"
-        response = requests.get(url, headers=self.headers)
+    def check_blob_sizes(self, github_repo_name, mirror_dir, gitlab_url=None):
+        if not self.max_blob_bytes:
+            return True
         
-        if response.status_code == 200:
-            return response.json()['login']
-        return None
+        refs = self.selected_local_refs(gitlab_url, mirror_dir)
+        blobs = self.find_large_blobs(mirror_dir, refs)
+        located = self.locate_blobs(mirror_dir, blobs, refs) if blobs else []
+        if blobs is None or located is None:
+            self.log(github_repo_name, f"   ERROR: Could not scan the mirror for files over "
+                                       f"{self.max_blob_bytes / 1024 ** 2:.0f} MB; use --max-blob-mb 0 to skip the scan")
+            return False
+        if not located:
+            return True
+        
+        self.large_blobs[github_repo_name] = located
+        self.log(github_repo_name, f"   ERROR: {len(located)} file(s) exceed {self.max_blob_bytes / 1024 ** 2:.0f} MB, "
+                                   f"not pushing:")
+        for sha, size, path, commits in located:
+            self.log(github_repo_name, f"      {path} ({size / 1024 ** 2:.1f} MB, blob {sha[:12]}) "
+                                       f"in {', '.join(commit[:12] for commit in commits)}")
+        return False
     
-    def get_user_organizations(self):
-        url = f"{self.github_api}/user/orgs"
-        response = requests.get(url, headers=self.headers)
+    def prepare_push(self, github_repo_name, mirror_dir, github_url, gitlab_url=None):
+        if not self.check_blob_sizes(github_repo_name, mirror_dir, gitlab_url):
+            return False
+        if self.needs_chunked_push(mirror_dir):
+            return self.push_in_chunks(github_repo_name, mirror_dir, github_url, gitlab_url)
+        return True
+    
+    def push_mirror(self, github_repo_name, mirror_dir, github_url, gitlab_url=None):
+        self.log(github_repo_name, f"   Pushing to GitHub...")
+        if not self.prepare_push(github_repo_name, mirror_dir, github_url, gitlab_url):
+            return False
         
-        if response.status_code == 200:
-            return [org['login'] for org in response.json()]
-        return []
+        size = self.estimated_size(gitlab_url, mirror_dir)
+        for command in self.push_commands(github_repo_name, github_url, gitlab_url):
+            result = self.run_git(github_repo_name, "Push", command, mirror_dir, size)
+            
+            if result.returncode != 0:
+                self.log(github_repo_name, f"   ERROR: Push failed: {result.stderr}")
+                return False
+        
+        self.record_stage(gitlab_url, github_repo_name, "pushed")
+        return True
+    
+    def keep_for_resume(self, gitlab_url, github_repo_name):
+        return (self.journal_reached(gitlab_url, github_repo_name, "cloned")
+                and not self.journal_reached(gitlab_url, github_repo_name, "pushed"))
+    
+    def cleanup(self, mirror_dir, keep=False):
+        try:
+            if keep and not (self.mirror_cache and self.mirror_cache.owns(mirror_dir)):
+                return
+            if self.mirror_cache and self.mirror_cache.owns(mirror_dir):
+                self.mirror_cache.release(mirror_dir)
+            else:
+                subprocess.run(["rm", "-rf", mirror_dir], check=True)
+        except Exception:
+            pass
+        finally:
+            self.disk_budget.release(mirror_dir)
     
     def import_repository(self, gitlab_url, github_repo_name, branch="main"):
-        print(f"\nImporting: {gitlab_url}")
-        print(f"   Target GitHub: {github_repo_name}")
+        self.branches.setdefault(gitlab_url, branch)
+        reason = self.skip_reason(gitlab_url, github_repo_name)
+        if reason:
+            self.log(github_repo_name, f"   SKIPPED: {github_repo_name} is {reason}")
+            return True
         
-        if self.organization:
-            owner = self.organization
-            print(f"   Target: Organization '{owner}'")
-        else:
-            owner = self.get_github_username()
-            if not owner:
-                print("ERROR: Failed to get GitHub username")
-                return False
-            print(f"   Target: User '{owner}'")
+        self.log(github_repo_name, f"\nImporting: {gitlab_url}")
+        self.log(github_repo_name, f"   Target GitHub: {github_repo_name}")
         
-        repo_info = self.create_github_repo(github_repo_name)
-        if not repo_info:
+        github_url = self.prepare_target(github_repo_name, gitlab_url)
+        if not github_url:
             return False
         
-        github_url = f"https://{self.github_token}@github.com/{owner}/{github_repo_name}.git"
+        if self.journal_reached(gitlab_url, github_repo_name, "pushed"):
+            self.log(github_repo_name, f"   Already pushed, verifying...")
+            return self.verify_import(gitlab_url, github_repo_name, github_url)
         
-        temp_dir = f"/tmp/gitlab_import_{github_repo_name}"
+        mirror_dir = self.acquire_mirror(gitlab_url, github_repo_name)
         
         try:
-            if os.path.exists(temp_dir):
-                subprocess.run(["rm", "-rf", temp_dir], check=True)
-            
-            print(f"   Cloning from GitLab...")
-            result = subprocess.run(
-                ["git", "clone", "--mirror", gitlab_url, temp_dir],
-                capture_output=True,
-                text=True
-            )
+            if not self.clone_mirror(gitlab_url, github_repo_name, mirror_dir):
+                return False
             
-            if result.returncode != 0:
-                print(f"   ERROR: Clone failed: {result.stderr}")
+            if not self.transfer_lfs(github_repo_name, mirror_dir, github_url):
+                return False
+            
+            if not self.push_mirror(github_repo_name, mirror_dir, github_url, gitlab_url):
                 return False
             
-            print(f"   Pushing to GitHub...")
-            os.chdir(temp_dir)
+            if not self.verify_import(gitlab_url, github_repo_name, github_url, mirror_dir):
+                return False
+            
+            self.log(github_repo_name, f"   SUCCESS: Repository imported")
+            return True
+            
+        except Exception as e:
+            self.log(github_repo_name, f"   ERROR: {e}")
+            return False
+        finally:
+            self.cleanup(mirror_dir, keep=self.keep_for_resume(gitlab_url, github_repo_name))
+    
+    async def github_request_async(self, method, url, **kwargs):
+        status, body, text, _ = await self.github_response_async(method, url, **kwargs)
+        return status, body, text
+    
+    async def github_response_async(self, method, url, **kwargs):
+        attempt = 0
+        failures = 0
+        while True:
+            entry = self.token_pool.acquire()
+            try:
+                wait = entry.limiter.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                
+                headers = dict(kwargs.get("headers") or {}, Authorization=entry.authorization())
+                async with self._aio_session.request(method, url, **dict(kwargs, headers=headers)) as response:
+                    self.api_requests += 1
+                    text = await response.text()
+                    try:
+                        body = await response.json(content_type=None)
+                    except ValueError:
+                        body = None
+                    links = response.links
+                    retry_after = entry.limiter.update(response.status, response.headers, text)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if failures >= self.retry_policy.retries:
+                    raise
+                failures += 1
+                await asyncio.sleep(self.api_retry_delay(f"{type(e).__name__}", failures))
+                continue
+            finally:
+                self.token_pool.release(entry)
+            
+            if (response.status in (401, 403) and retry_after is None
+                    and self.token_pool.disable(entry, response.status)):
+                continue
+            if self.retry_policy.is_transient_status(response.status) and failures < self.retry_policy.retries:
+                failures += 1
+                await asyncio.sleep(self.api_retry_delay(response.status, failures))
+                continue
+            if retry_after is None or attempt >= entry.limiter.max_retries:
+                return response.status, body, text, links
             
-            result = subprocess.run(
-                ["git", "push", "--mirror", github_url],
-                capture_output=True,
-                text=True
+            attempt += 1
+            print(f"WARNING: GitHub rate limit hit, retrying in {retry_after:.0f}s")
+    
+    async def create_github_repo_async(self, repo_name, description="", private=False):
+        if self.repo_exists(repo_name):
+            return self.existing_repo_info(repo_name)
+        
+        url, data = self.create_repo_request(repo_name, description, private)
+        status, body, text = await self.github_request_async("POST", url, json=data)
+        
+        return self.handle_create_response(repo_name, status, body, text)
+    
+    async def get_github_username_async(self):
+        status, body, _ = await self.github_request_async("GET", f"{self.github_api}/user")
+        
+        if status == 200:
+            return body['login']
+        return None
+    
+    async def paginate_async(self, url, params=None):
+        params = dict(params or {}, per_page=100)
+        next_url = url
+        while next_url:
+            status, body, text, links = await self.github_response_async("GET", next_url, params=params)
+            if status != 200:
+                raise GitHubAPIError(status_code=status, text=text)
+            for item in body:
+                yield item
+            next_link = links.get("next")
+            next_url = str(next_link["url"]) if next_link else None
+            params = None
+    
+    async def get_user_organizations_async(self):
+        try:
+            return [org['login'] async for org in self.paginate_async(f"{self.github_api}/user/orgs")]
+        except GitHubAPIError:
+            return []
+    
+    async def list_organizations_async(self):
+        async with self.create_aio_session() as session:
+            self._aio_session = session
+            try:
+                return await self.get_user_organizations_async()
+            finally:
+                self._aio_session = None
+    
+    def list_organizations(self):
+        if self.engine == "asyncio":
+            return asyncio.run(self.list_organizations_async())
+        return self.get_user_organizations()
+    
+    async def get_owner_async(self):
+        if self.organization:
+            return self.organization
+        
+        async with self._owner_lock_async:
+            if not self._username:
+                self._username = await self.get_github_username_async()
+            return self._username
+    
+    async def run_network_git_async(self, github_repo_name, operation, command, cwd=None, size=0):
+        timeout = self.git_timeout_for(size)
+        stalls = failures = 0
+        while True:
+            process = await asyncio.create_subprocess_exec(
+                *self.network_git(self.progress_command(command)),
+                cwd=cwd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                start_new_session=True
             )
+            progress = self.open_progress(github_repo_name, command)
+            try:
+                returncode = await asyncio.wait_for(self.pump_progress_async(process, progress), timeout)
+            except asyncio.TimeoutError:
+                kill_process_group(process.pid)
+                await process.wait()
+                returncode = None
+            except BaseException:
+                kill_process_group(process.pid)
+                raise
+            finally:
+                progress.close()
             
-            if result.returncode != 0:
-                print(f"   ERROR: Push failed: {result.stderr}")
+            if returncode is None:
+                stderr = f"{progress.text()}\nkilled after {timeout:.0f}s"
+            else:
+                stderr = progress.text()
+            
+            failure = self.classify_git_failure(returncode, stderr)
+            if failure in ("timeout", "too slow"):
+                self.record_stall(github_repo_name, operation, failure, stalls)
+                if stalls >= self.stall_retries:
+                    return -9 if returncode is None else returncode, "", stderr
+                stalls += 1
+            elif failure == "transient" and failures < self.retry_policy.retries:
+                failures += 1
+                await asyncio.sleep(self.git_retry_delay(github_repo_name, operation, failures))
+            else:
+                return returncode, "", stderr
+            await asyncio.to_thread(self.prepare_retry, command)
+    
+    async def pump_progress_async(self, process, progress):
+        while True:
+            data = await process.stdout.read(65536)
+            if not data:
+                break
+            progress.feed(data)
+        return await process.wait()
+    
+    async def remove_dir_async(self, path):
+        if os.path.exists(path):
+            await asyncio.to_thread(shutil.rmtree, path, ignore_errors=True)
+    
+    async def reserve_disk_async(self, gitlab_url, github_repo_name, mirror_dir):
+        size = await asyncio.to_thread(self.estimated_size, gitlab_url, mirror_dir)
+        written = await asyncio.to_thread(self.disk_budget.on_disk, mirror_dir) if size else None
+        if self.disk_budget.try_reserve(mirror_dir, size, written):
+            return
+        
+        started = time.monotonic()
+        while not self.disk_budget.try_reserve(mirror_dir, size, written):
+            await asyncio.sleep(self.disk_budget.interval)
+        waited = self.disk_budget.record_wait(started)
+        if waited >= 1:
+            self.log(github_repo_name, f"   Waited {format_duration(waited)} for disk space")
+    
+    async def clone_mirror_async(self, gitlab_url, github_repo_name, mirror_dir):
+        await self.reserve_disk_async(gitlab_url, github_repo_name, mirror_dir)
+        if self.can_reuse_mirror(gitlab_url, github_repo_name, mirror_dir):
+            self.log(github_repo_name, f"   Updating existing mirror from GitLab...")
+            if self.lean_branch(gitlab_url) is None:
+                await asyncio.to_thread(self.configure_fetch, mirror_dir)
+            size = await asyncio.to_thread(self.estimated_size, gitlab_url, mirror_dir)
+            returncode, _, stderr = await self.run_network_git_async(github_repo_name, "Fetch", self.update_command(),
+                                                                     mirror_dir, size)
+            
+            if returncode == 0:
+                return await asyncio.to_thread(self.finish_clone, gitlab_url, github_repo_name, mirror_dir)
+            self.log(github_repo_name, f"   WARNING: Mirror update failed, cloning again: {stderr}")
+        
+        await self.remove_dir_async(mirror_dir)
+        
+        reference = None
+        if self.object_store:
+            reference = await self.object_store.reference_for_async(gitlab_url)
+        self.log_clone_start(gitlab_url, github_repo_name, reference)
+        
+        try:
+            size = self.repo_sizes.get(gitlab_url, 0)
+            for command, cwd in await asyncio.to_thread(self.prepare_clone, gitlab_url, mirror_dir, reference):
+                returncode, _, stderr = await self.run_network_git_async(github_repo_name, "Clone", command, cwd, size)
+                if returncode != 0:
+                    break
+        except BaseException:
+            if self.object_store and not reference:
+                self.object_store.abandon(gitlab_url)
+            raise
+        
+        if returncode != 0:
+            if self.object_store and not reference:
+                self.object_store.abandon(gitlab_url)
+            self.log(github_repo_name, f"   ERROR: Clone failed: {stderr}")
+            return False
+        
+        if self.object_store and not reference:
+            await asyncio.to_thread(self.object_store.seed, gitlab_url, mirror_dir)
+        
+        return await asyncio.to_thread(self.finish_clone, gitlab_url, github_repo_name, mirror_dir)
+    
+    async def import_repository_async(self, gitlab_url, github_repo_name, branch="main"):
+        self.branches.setdefault(gitlab_url, branch)
+        reason = self.skip_reason(gitlab_url, github_repo_name)
+        if reason:
+            self.log(github_repo_name, f"   SKIPPED: {github_repo_name} is {reason}")
+            return True
+        
+        self.log(github_repo_name, f"\nImporting: {gitlab_url}")
+        self.log(github_repo_name, f"   Target GitHub: {github_repo_name}")
+        
+        owner = await self.get_owner_async()
+        if not owner:
+            self.log(github_repo_name, "ERROR: Failed to get GitHub username")
+            return False
+        
+        if self.organization:
+            self.log(github_repo_name, f"   Target: Organization '{owner}'")
+        else:
+            self.log(github_repo_name, f"   Target: User '{owner}'")
+        
+        if not self.journal_reached(gitlab_url, github_repo_name, "created"):
+            repo_info = await self.create_github_repo_async(github_repo_name)
+            if not repo_info:
+                return False
+            await asyncio.to_thread(self.record_stage, gitlab_url, github_repo_name, "created")
+        
+        github_url = self.github_push_url(owner, github_repo_name)
+        if self.journal_reached(gitlab_url, github_repo_name, "pushed"):
+            self.log(github_repo_name, f"   Already pushed, verifying...")
+            return await asyncio.to_thread(self.verify_import, gitlab_url, github_repo_name, github_url)
+        
+        if self.mirror_cache:
+            mirror_dir = await asyncio.to_thread(self.acquire_mirror, gitlab_url, github_repo_name)
+        else:
+            mirror_dir = self.temp_dir_for(gitlab_url, github_repo_name)
+        
+        try:
+            if not await self.clone_mirror_async(gitlab_url, github_repo_name, mirror_dir):
+                return False
+            
+            if not await asyncio.to_thread(self.transfer_lfs, github_repo_name, mirror_dir, github_url):
+                return False
+            
+            self.log(github_repo_name, f"   Pushing to GitHub...")
+            if not await asyncio.to_thread(self.prepare_push, github_repo_name, mirror_dir, github_url, gitlab_url):
                 return False
             
-            print(f"   SUCCESS: Repository imported")
+            size = await asyncio.to_thread(self.estimated_size, gitlab_url, mirror_dir)
+            for command in self.push_commands(github_repo_name, github_url, gitlab_url):
+                returncode, _, stderr = await self.run_network_git_async(github_repo_name, "Push", command,
+                                                                         mirror_dir, size)
+                
+                if returncode != 0:
+                    self.log(github_repo_name, f"   ERROR: Push failed: {stderr}")
+                    return False
+            await asyncio.to_thread(self.record_stage, gitlab_url, github_repo_name, "pushed")
             
-            os.chdir("/")
-            subprocess.run(["rm", "-rf", temp_dir], check=True)
+            if not await asyncio.to_thread(self.verify_import, gitlab_url, github_repo_name, github_url, mirror_dir):
+                return False
             
+            self.log(github_repo_name, f"   SUCCESS: Repository imported")
             return True
             
         except Exception as e:
-            print(f"   ERROR: {e}")
+            self.log(github_repo_name, f"   ERROR: {e}")
+            return False
+        finally:
             try:
-                os.chdir("/")
-                subprocess.run(["rm", "-rf", temp_dir], check=True)
-            except:
+                if self.mirror_cache and self.mirror_cache.owns(mirror_dir):
+                    await asyncio.to_thread(self.cleanup, mirror_dir)
+                elif not self.keep_for_resume(gitlab_url, github_repo_name):
+                    await self.remove_dir_async(mirror_dir)
+            except Exception:
                 pass
-            return False
+            finally:
+                self.disk_budget.release(mirror_dir)
+    
+    async def import_project_async(self, semaphore, index, total, proj, repo_name):
+        async with semaphore:
+            with self._print_lock:
+                print(f"[{index}/{total}] Starting {proj['name']} -> {repo_name}")
+            return await self.import_repository_async(proj['gitlab_url'], repo_name, self.project_branch(proj))
+    
+    async def count_aio_connection(self, session, context, params):
+        self.aio_connections += 1
+    
+    def create_aio_session(self):
+        connector = aiohttp.TCPConnector(limit=self.api_pool_size(), keepalive_timeout=60)
+        timeout = aiohttp.ClientTimeout(total=self.api_timeout)
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_create_end.append(self.count_aio_connection)
+        return aiohttp.ClientSession(headers=self.headers, connector=connector, timeout=timeout,
+                                     trace_configs=[trace])
+    
+    async def run_imports_async(self, projects, prefix="", custom_names=None):
+        semaphore = asyncio.Semaphore(self.jobs)
+        self._owner_lock_async = asyncio.Lock()
+        total = len(projects)
+        repo_names = [self.target_repo_name(proj, prefix, custom_names) for proj in projects]
+        
+        async with self.create_aio_session() as session:
+            self._aio_session = session
+            try:
+                outcomes = await asyncio.gather(
+                    *(self.import_project_async(semaphore, i, total, proj, repo_name)
+                      for i, (proj, repo_name) in enumerate(zip(projects, repo_names), 1)),
+                    return_exceptions=True
+                )
+            finally:
+                self._aio_session = None
+        
+        results = {}
+        for proj, repo_name, outcome in zip(projects, repo_names, outcomes):
+            if isinstance(outcome, BaseException):
+                print(f"[{repo_name}] ERROR: {outcome}")
+                results[(proj['gitlab_url'], repo_name)] = False
+            else:
+                results[(proj['gitlab_url'], repo_name)] = outcome
+        
+        return results
+    
+    def gitlab_project_url(self, gitlab_url):
+        parsed = urlparse(gitlab_url)
+        if parsed.scheme not in ("http", "https", "ssh") or not parsed.hostname:
+            return None
+        path = parsed.path.strip('/')
+        if path.endswith('.git'):
+            path = path[:-4]
+        host = f"{parsed.hostname}:{parsed.port}" if parsed.port and parsed.scheme != "ssh" else parsed.hostname
+        scheme = "https" if parsed.scheme == "ssh" else parsed.scheme
+        return f"{scheme}://{host}/api/v4/projects/{quote(path, safe='')}"
+    
+    def gitlab_project_size(self, session, proj):
+        url = self.gitlab_project_url(proj['gitlab_url'])
+        if not url:
+            return None
+        try:
+            response = session.get(url, params={"statistics": "true"}, timeout=self.api_timeout)
+            if response.status_code != 200:
+                return None
+            return (response.json().get("statistics") or {}).get("repository_size")
+        except (requests.RequestException, ValueError):
+            return None
+    
+    def collect_sizes(self, projects, prefix="", custom_names=None):
+        sizes = {}
+        if self.journal:
+            for proj in projects:
+                key = self.journal_key(proj['gitlab_url'], self.target_repo_name(proj, prefix, custom_names))
+                if self.journal.size(key):
+                    sizes[proj['gitlab_url']] = self.journal.size(key)
+        
+        missing = [proj for proj in projects if proj['gitlab_url'] not in sizes]
+        if missing and self.gitlab_token:
+            session = requests.Session()
+            session.headers["PRIVATE-TOKEN"] = self.gitlab_token
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                for proj, size in zip(missing, executor.map(lambda proj: self.gitlab_project_size(session, proj), missing)):
+                    if size:
+                        sizes[proj['gitlab_url']] = size
+        
+        return sizes
+    
+    def estimate_makespan(self, sizes, workers):
+        loads = [0.0] * workers
+        for size in sizes:
+            heapq.heapreplace(loads, loads[0] + 5 + size / self.estimate_rate)
+        return max(loads)
+    
+    def schedule_largest_first(self, projects, prefix="", custom_names=None):
+        print("Collecting repository sizes...")
+        sizes = self.collect_sizes(projects, prefix, custom_names)
+        known = sorted(sizes.values())
+        default = known[len(known) // 2] if known else 0
+        
+        def estimate(proj):
+            return sizes.get(proj['gitlab_url'], default)
+        
+        ordered = sorted(projects, key=estimate, reverse=True)
+        self.repo_sizes.update(sizes)
+        
+        workers = self.clone_jobs if self.engine == "pipeline" else self.jobs
+        largest_first = self.estimate_makespan([estimate(proj) for proj in ordered], workers)
+        manifest_order = self.estimate_makespan([estimate(proj) for proj in projects], workers)
+        print(f"Sizes known for {len(sizes)}/{len(projects)} projects, "
+              f"{sum(estimate(proj) for proj in projects) / 1024 ** 3:.1f} GB in total")
+        print(f"Estimated makespan with {workers} workers at {self.estimate_rate / 1024 ** 2:.0f} MB/s each: "
+              f"{format_duration(largest_first)} largest first "
+              f"(manifest order: {format_duration(manifest_order)})")
+        return ordered
     
     def extract_repo_name(self, project_name):
         parts = project_name.split('/')
         return parts[-1] if parts else project_name
     
+    def duplicate_targets(self, projects, prefix="", custom_names=None):
+        targets = {}
+        for proj in projects:
+            targets.setdefault(self.target_repo_name(proj, prefix, custom_names), []).append(proj['name'])
+        return {repo_name: names for repo_name, names in targets.items() if len(names) > 1}
+    
+    def target_repo_name(self, proj, prefix="", custom_names=None):
+        repo_name = custom_names.get(proj['name'], self.extract_repo_name(proj['name'])) if custom_names else self.extract_repo_name(proj['name'])
+        if prefix:
+            repo_name = f"{prefix}{repo_name}"
+        return repo_name
+    
+    def import_project(self, index, total, proj, repo_name):
+        if self.jobs == 1:
+            print(f"\n[{index}/{total}]")
+        else:
+            with self._print_lock:
+                print(f"[{index}/{total}] Starting {proj['name']} -> {repo_name}")
+        
+        return self.import_repository(proj['gitlab_url'], repo_name, self.project_branch(proj))
+    
+    def run_imports(self, projects, prefix="", custom_names=None):
+        results = {}
+        total = len(projects)
+        
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            futures = {}
+            for i, proj in enumerate(projects, 1):
+                repo_name = self.target_repo_name(proj, prefix, custom_names)
+                future = executor.submit(self.import_project, i, total, proj, repo_name)
+                futures[future] = (proj['gitlab_url'], repo_name)
+            
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    print(f"[{key[1]}] ERROR: {e}")
+                    results[key] = False
+        
+        return results
+    
+    def print_summary(self, results):
+        success_count = sum(1 for ok in results.values() if ok)
+        failed = [name for (_, name), ok in results.items() if not ok]
+        
+        print("\n" + "=" * 60)
+        print("Import Summary:")
+        print(f"   Successful: {success_count}")
+        if self.sync:
+            up_to_date = sum(1 for (_, name), ok in results.items() if ok and self.is_up_to_date(name))
+            print(f"   Up to date (skipped): {up_to_date}")
+        if self.journal:
+            print(f"   Journal: {self.journal.path}")
+        if self.lfs_stats:
+            fetched = sum(stats["fetched_bytes"] for stats in self.lfs_stats.values())
+            uploaded = sum(stats["uploaded_bytes"] for stats in self.lfs_stats.values())
+            print(f"   LFS: {fetched / 1024 ** 2:.1f} MB fetched, {uploaded / 1024 ** 2:.1f} MB uploaded")
+            for name in sorted(self.lfs_stats):
+                stats = self.lfs_stats[name]
+                print(f"      - {name}: {stats['objects']} objects, "
+                      f"{stats['fetched_bytes'] / 1024 ** 2:.1f} MB fetched, "
+                      f"{stats['uploaded_bytes'] / 1024 ** 2:.1f} MB uploaded")
+        if self.object_store:
+            print(f"   Shared objects: {self.object_store.seeded} families seeded, "
+                  f"{self.object_store.referenced} clones reused them")
+        print(f"   Failed: {len(failed)}")
+        for name in sorted(failed):
+            print(f"      - {name}")
+        if self.large_blobs:
+            print(f"   Files over GitHub's size limit:")
+            for name in sorted(self.large_blobs):
+                for sha, size, path, commits in self.large_blobs[name]:
+                    print(f"      - {name}: {path} ({size / 1024 ** 2:.1f} MB) in "
+                          f"{', '.join(commit[:12] for commit in commits)}")
+        print(f"   Total: {len(results)}")
+        if self.retry_policy.retried:
+            print(f"   Transient errors retried: {self.retry_policy.retried}")
+        if self.transfer_meter.started is not None:
+            print(f"   Git transfers: {self.transfer_meter.summary()}")
+        if self.log_dir:
+            print(f"   Git logs: {self.log_dir}")
+        if self.stalls:
+            kinds = {}
+            for stall in self.stalls:
+                kinds[stall["kind"]] = kinds.get(stall["kind"], 0) + 1
+            repos = sorted({stall["repo"] for stall in self.stalls})
+            print(f"   Stalled git operations: {len(self.stalls)} "
+                  f"({', '.join(f'{count} {kind}' for kind, count in sorted(kinds.items()))}) "
+                  f"in {', '.join(repos)}")
+        print(f"   GitHub API: {self.token_pool.summary()}")
+        if self.github_app:
+            print(f"   GitHub App: installation {self.github_app.installation_id}, "
+                  f"{self.github_app.refreshed} token refreshes")
+        stats = self.connection_stats()
+        print(f"   GitHub connections: {stats['connections']} opened, "
+              f"{stats['reused']} of {stats['requests']} requests reused a connection")
+        if self.mirror_cache:
+            print(f"   Mirror cache: {self.mirror_cache.cache_dir} ({self.mirror_cache.evicted} evicted)")
+        print(f"   Disk: {self.disk_budget.summary()}")
+        print("=" * 60)
+    
     def process_manifest(self, manifest_path, prefix="", custom_names=None):
         print("GitLab to GitHub Importer")
         print("=" * 60)
@@ -177,20 +2544,40 @@ class GitLabToGitHub:
         
         print(f"\nFound {len(projects)} projects to import")
         
+        duplicates = self.duplicate_targets(projects, prefix, custom_names)
+        if duplicates:
+            for repo_name, names in sorted(duplicates.items()):
+                print(f"ERROR: {', '.join(names)} would all be imported as '{repo_name}'")
+            print("Split these projects into separate manifests and import them with different prefixes")
+            return
+        
         if self.organization:
             print(f"Target: Organization '{self.organization}'")
         else:
-            username = self.get_github_username()
+            username = self.get_owner()
             print(f"Target: User '{username}'")
         
         print()
         
+        if self.largest_first:
+            projects = self.schedule_largest_first(projects, prefix, custom_names)
+            print()
+        elif self.jobs > 1 or self.engine == "pipeline":
+            self.repo_sizes.update(self.collect_sizes(projects, prefix, custom_names))
+        
         print("Projects to be imported:")
         for i, proj in enumerate(projects, 1):
-            repo_name = custom_names.get(proj['name'], self.extract_repo_name(proj['name'])) if custom_names else self.extract_repo_name(proj['name'])
-            if prefix:
-                repo_name = f"{prefix}{repo_name}"
-            print(f"  {i}. {proj['name']} -> {repo_name}")
+            repo_name = self.target_repo_name(proj, prefix, custom_names)
+            size = self.repo_sizes.get(proj['gitlab_url'])
+            if size:
+                print(f"  {i}. {proj['name']} -> {repo_name} ({size / 1024 ** 2:.1f} MB)")
+            else:
+                print(f"  {i}. {proj['name']} -> {repo_name}")
+        
+        if self.engine == "pipeline":
+            print(f"\nPipeline: {self.clone_jobs} clone / {self.push_jobs} push workers, queue size {self.queue_size}")
+        elif self.jobs > 1:
+            print(f"\nParallel imports: {self.jobs} ({self.engine} engine)")
         
         print("\n" + "=" * 60)
         confirm = input("\nContinue with import? (y/n): ")
@@ -199,30 +2586,244 @@ class GitLabToGitHub:
             print("Import cancelled")
             return
         
-        success_count = 0
-        failed_count = 0
+        for proj in projects:
+            self.branches[proj['gitlab_url']] = self.project_branch(proj)
         
-        for i, proj in enumerate(projects, 1):
-            print(f"\n[{i}/{len(projects)}]")
+        if self.workspace:
+            self.scan_workspace(projects)
+        
+        if self.preflight == "graphql":
+            print("\nLooking up target repositories on GitHub...")
+            self.lookup_repos([self.target_repo_name(proj, prefix, custom_names) for proj in projects])
+        elif self.preflight:
+            print("\nListing existing GitHub repositories...")
+            self.build_repo_index()
+        
+        if self.sync:
+            self.plan_sync(projects, prefix, custom_names)
+        
+        if self.engine == "asyncio":
+            results = asyncio.run(self.run_imports_async(projects, prefix, custom_names))
+        elif self.engine == "pipeline":
+            pipeline = ImportPipeline(self, self.clone_jobs, self.push_jobs, self.queue_size)
+            results = pipeline.run(projects, prefix, custom_names)
+            pipeline.print_stats()
+        else:
+            results = self.run_imports(projects, prefix, custom_names)
+        if self.journal:
+            self.journal.close()
+        self.print_summary(results)
+        
+        return results
+
+
+class StageStats:
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.completed = 0
+        self.failed = 0
+        self.bytes = 0
+        self.busy_seconds = 0.0
+        self.started = None
+        self.finished = None
+        self.lock = threading.Lock()
+    
+    def record(self, success, elapsed, size=0):
+        with self.lock:
+            now = time.monotonic()
+            if self.started is None:
+                self.started = now - elapsed
+            self.finished = now
+            self.busy_seconds += elapsed
+            if success:
+                self.completed += 1
+                self.bytes += size
+            else:
+                self.failed += 1
+    
+    def wall_seconds(self):
+        if self.started is None:
+            return 0.0
+        return max(self.finished - self.started, 1e-6)
+    
+    def summary(self):
+        wall = self.wall_seconds()
+        if not wall:
+            return f"   {self.name:<8} no work"
+        
+        repos_per_min = self.completed * 60 / wall
+        mb_per_sec = self.bytes / wall / (1024 * 1024)
+        utilization = self.busy_seconds / (wall * self.workers) * 100
+        return (f"   {self.name:<8} {self.completed} ok / {self.failed} failed, "
+                f"{repos_per_min:.1f} repos/min, {mb_per_sec:.2f} MB/s, "
+                f"{utilization:.0f}% busy ({self.workers} workers)")
+
+
+class ImportPipeline:
+    _DONE = object()
+    
+    def __init__(self, importer, clone_jobs, push_jobs, queue_size):
+        self.importer = importer
+        self.clone_jobs = clone_jobs
+        self.push_jobs = push_jobs
+        self.pending = queue.Queue()
+        self.lfs_queue = queue.Queue(maxsize=queue_size)
+        self.push_queue = queue.Queue(maxsize=queue_size)
+        self.cleanup_queue = queue.Queue()
+        self.results = {}
+        self.results_lock = threading.Lock()
+        self.stats = {
+            "clone": StageStats("clone", clone_jobs),
+            "lfs": StageStats("lfs", push_jobs),
+            "push": StageStats("push", push_jobs),
+            "cleanup": StageStats("cleanup", 1),
+        }
+    
+    def set_result(self, gitlab_url, repo_name, success):
+        with self.results_lock:
+            self.results[(gitlab_url, repo_name)] = success
+    
+    def clone_worker(self):
+        importer = self.importer
+        while True:
+            try:
+                index, total, proj, repo_name = self.pending.get_nowait()
+            except queue.Empty:
+                return
+            
+            gitlab_url = proj['gitlab_url']
+            reason = importer.skip_reason(gitlab_url, repo_name)
+            if reason:
+                importer.log(repo_name, f"   SKIPPED: {repo_name} is {reason}")
+                self.set_result(gitlab_url, repo_name, True)
+                continue
+            
+            with importer._print_lock:
+                print(f"[{index}/{total}] Starting {proj['name']} -> {repo_name}")
+            try:
+                github_url = importer.prepare_target(repo_name, gitlab_url)
+            except Exception as e:
+                importer.log(repo_name, f"   ERROR: {e}")
+                github_url = None
+            
+            if github_url and importer.journal_reached(gitlab_url, repo_name, "pushed"):
+                importer.log(repo_name, f"   Already pushed, verifying...")
+                started = time.monotonic()
+                success = importer.verify_import(gitlab_url, repo_name, github_url)
+                self.stats["push"].record(success, time.monotonic() - started)
+                self.set_result(gitlab_url, repo_name, success)
+                continue
+            
+            temp_dir = importer.acquire_mirror(gitlab_url, repo_name)
+            started = time.monotonic()
+            try:
+                success = bool(github_url) and importer.clone_mirror(gitlab_url, repo_name, temp_dir)
+            except Exception as e:
+                importer.log(repo_name, f"   ERROR: {e}")
+                success = False
+            
+            size = importer.repo_sizes.get(gitlab_url, 0) if success else 0
+            self.stats["clone"].record(success, time.monotonic() - started, size)
+            
+            if success:
+                next_queue = self.lfs_queue if importer.lfs else self.push_queue
+                next_queue.put((gitlab_url, repo_name, temp_dir, github_url, size))
+            else:
+                self.set_result(gitlab_url, repo_name, False)
+                self.cleanup_queue.put((temp_dir, False))
+    
+    def lfs_worker(self):
+        importer = self.importer
+        while True:
+            job = self.lfs_queue.get()
+            if job is self._DONE:
+                return
             
-            repo_name = custom_names.get(proj['name'], self.extract_repo_name(proj['name'])) if custom_names else self.extract_repo_name(proj['name'])
-            if prefix:
-                repo_name = f"{prefix}{repo_name}"
+            gitlab_url, repo_name, temp_dir, github_url, size = job
+            started = time.monotonic()
+            try:
+                success = importer.transfer_lfs(repo_name, temp_dir, github_url)
+            except Exception as e:
+                importer.log(repo_name, f"   ERROR: {e}")
+                success = False
             
-            if self.import_repository(proj['gitlab_url'], repo_name, proj['revision']):
-                success_count += 1
+            stats = importer.lfs_stats.get(repo_name, {})
+            self.stats["lfs"].record(success, time.monotonic() - started, stats.get("fetched_bytes", 0))
+            if success:
+                self.push_queue.put(job)
             else:
-                failed_count += 1
+                self.set_result(gitlab_url, repo_name, False)
+                self.cleanup_queue.put((temp_dir, importer.keep_for_resume(gitlab_url, repo_name)))
+    
+    def push_worker(self):
+        importer = self.importer
+        while True:
+            job = self.push_queue.get()
+            if job is self._DONE:
+                return
+            
+            gitlab_url, repo_name, temp_dir, github_url, size = job
+            started = time.monotonic()
+            try:
+                success = (importer.push_mirror(repo_name, temp_dir, github_url, gitlab_url)
+                           and importer.verify_import(gitlab_url, repo_name, github_url, temp_dir))
+            except Exception as e:
+                importer.log(repo_name, f"   ERROR: {e}")
+                success = False
             
-            if i < len(projects):
-                time.sleep(2)
+            self.stats["push"].record(success, time.monotonic() - started, size)
+            if success:
+                importer.log(repo_name, f"   SUCCESS: Repository imported")
+            self.set_result(gitlab_url, repo_name, success)
+            self.cleanup_queue.put((temp_dir, importer.keep_for_resume(gitlab_url, repo_name)))
+    
+    def cleanup_worker(self):
+        while True:
+            job = self.cleanup_queue.get()
+            if job is self._DONE:
+                return
+            
+            temp_dir, keep = job
+            started = time.monotonic()
+            self.importer.cleanup(temp_dir, keep)
+            self.stats["cleanup"].record(True, time.monotonic() - started)
+    
+    def run(self, projects, prefix="", custom_names=None):
+        total = len(projects)
+        for i, proj in enumerate(projects, 1):
+            repo_name = self.importer.target_repo_name(proj, prefix, custom_names)
+            self.pending.put((i, total, proj, repo_name))
         
-        print("\n" + "=" * 60)
-        print("Import Summary:")
-        print(f"   Successful: {success_count}")
-        print(f"   Failed: {failed_count}")
-        print(f"   Total: {len(projects)}")
-        print("=" * 60)
+        cloners = [threading.Thread(target=self.clone_worker, daemon=True) for _ in range(self.clone_jobs)]
+        lfs_workers = [threading.Thread(target=self.lfs_worker, daemon=True)
+                       for _ in range(self.push_jobs if self.importer.lfs else 0)]
+        pushers = [threading.Thread(target=self.push_worker, daemon=True) for _ in range(self.push_jobs)]
+        cleaner = threading.Thread(target=self.cleanup_worker, daemon=True)
+        
+        for thread in cloners + lfs_workers + pushers + [cleaner]:
+            thread.start()
+        
+        for thread in cloners:
+            thread.join()
+        for _ in lfs_workers:
+            self.lfs_queue.put(self._DONE)
+        for thread in lfs_workers:
+            thread.join()
+        for _ in pushers:
+            self.push_queue.put(self._DONE)
+        for thread in pushers:
+            thread.join()
+        self.cleanup_queue.put(self._DONE)
+        cleaner.join()
+        
+        return self.results
+    
+    def print_stats(self):
+        print("\nPipeline Stages:")
+        for name, stats in self.stats.items():
+            if name != "lfs" or self.importer.lfs:
+                print(stats.summary())
 
 
 def select_target():
@@ -248,7 +2849,199 @@ def select_target():
             print("ERROR: Invalid option. Please select 1 or 2.")
 
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Import repositories from GitLab to GitHub via manifest.xml")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of repositories to import in parallel (default: 1)")
+    parser.add_argument("--engine", choices=["threads", "asyncio", "pipeline"], default="threads",
+                        help="execution engine: worker threads, a single asyncio event loop, "
+                             "or separate clone/push stages (default: threads)")
+    parser.add_argument("--clone-jobs", type=int,
+                        help="pipeline engine: concurrent clones (default: --jobs)")
+    parser.add_argument("--push-jobs", type=int,
+                        help="pipeline engine: concurrent pushes (default: --jobs)")
+    parser.add_argument("--queue-size", type=int,
+                        help="pipeline engine: cloned mirrors allowed to wait for a push slot (default: --push-jobs)")
+    parser.add_argument("--api-rate", type=float, default=10.0,
+                        help="maximum GitHub API requests per second; lowered automatically "
+                             "from the rate-limit headers (default: 10)")
+    parser.add_argument("--token-file",
+                        help="file with additional GitHub tokens, one per line; API calls and pushes "
+                             "are spread across all tokens (also: GITHUB_TOKENS, comma-separated)")
+    parser.add_argument("--app-id",
+                        help="authenticate as this GitHub App instead of (or in addition to) tokens; "
+                             "requires --app-key and an organization target")
+    parser.add_argument("--app-key",
+                        help="PEM private key of the GitHub App given with --app-id")
+    parser.add_argument("--app-installation-id",
+                        help="installation of the GitHub App to use (default: the one on the target organization)")
+    parser.add_argument("--api-timeout", type=float, default=30,
+                        help="timeout in seconds for each GitHub API request (default: 30)")
+    parser.add_argument("--sync", action="store_true",
+                        help="compare GitLab and GitHub refs first; skip repositories that match "
+                             "and push only the refs that differ")
+    parser.add_argument("--preflight", nargs="?", const="list", choices=["list", "graphql"],
+                        help="find existing target repositories up front instead of through failed "
+                             "create requests: 'list' pages through all of the target's repositories "
+                             "(default), 'graphql' looks up only the target names, 100 per query")
+    parser.add_argument("--shared-objects",
+                        help="directory of shared bare repositories; projects of the same family "
+                             "clone with --reference so common history is downloaded once")
+    parser.add_argument("--object-family", action="append", default=[], metavar="REGEX=FAMILY",
+                        help="put projects whose GitLab URL matches REGEX into FAMILY "
+                             "(default family: repository name); may be repeated")
+    parser.add_argument("--workspace",
+                        help="synced repo-tool workspace for the same manifest; its local objects "
+                             "are used as clone references so only missing objects are fetched")
+    parser.add_argument("--lean", action="store_true",
+                        help="import only each project's manifest revision and the tags reachable "
+                             "from it instead of mirroring every ref")
+    parser.add_argument("--refs", action="append", default=[], metavar="PATTERN",
+                        help="lean mode: also import refs matching this glob, e.g. 'refs/heads/release/*'; "
+                             "may be repeated")
+    parser.add_argument("--include-refs", action="append", default=[], metavar="PATTERN",
+                        help="mirror only refs matching this glob (default: refs/*); may be repeated")
+    parser.add_argument("--exclude-refs", action="append", default=[], metavar="PATTERN",
+                        help="never fetch or push refs matching this glob; may be repeated. "
+                             "Added to the GitLab defaults: " + ", ".join(GITLAB_INTERNAL_REFS))
+    parser.add_argument("--keep-gitlab-refs", action="store_true",
+                        help="do not exclude GitLab-internal refs by default")
+    parser.add_argument("--max-push-mb", type=float, default=1800,
+                        help="push history in chunks below this size when a repository is larger "
+                             "than one GitHub push allows; 0 disables chunking (default: 1800)")
+    parser.add_argument("--max-blob-mb", type=float, default=100,
+                        help="fail repositories containing files larger than this before pushing "
+                             "(GitHub's limit is 100); 0 disables the scan (default: 100)")
+    parser.add_argument("--lfs", action="store_true",
+                        help="also copy Git LFS objects from GitLab to GitHub (requires git-lfs)")
+    parser.add_argument("--lfs-transfers", type=int, default=8,
+                        help="concurrent LFS transfers per repository (default: 8)")
+    parser.add_argument("--low-speed-limit", type=int, default=1,
+                        help="abort a git transfer slower than this many bytes/s for --low-speed-time "
+                             "(http.lowSpeedLimit, default: 1; 0 disables)")
+    parser.add_argument("--low-speed-time", type=int, default=300,
+                        help="seconds a git transfer may stay below --low-speed-limit (default: 300)")
+    parser.add_argument("--git-timeout", type=float, default=1800,
+                        help="base wall-clock limit in seconds for one git operation of known size; "
+                             "0 disables (default: 1800)")
+    parser.add_argument("--git-timeout-per-gb", type=float, default=900,
+                        help="extra seconds allowed per GB of estimated repository size (default: 900)")
+    parser.add_argument("--stall-retries", type=int, default=2,
+                        help="times to retry a git operation that stalled or timed out (default: 2)")
+    parser.add_argument("--log-dir",
+                        help="write the full git output of each repository to <DIR>/<repo>.log")
+    parser.add_argument("--progress-interval", type=float, default=30,
+                        help="log transfer progress of running git operations every N seconds; "
+                             "0 disables (default: 30)")
+    parser.add_argument("--retries", type=int, default=3,
+                        help="retries for transient GitHub API and git errors (5xx, connection resets, "
+                             "early EOF), with exponential backoff (default: 3)")
+    parser.add_argument("--retry-delay", type=float, default=2.0,
+                        help="base delay in seconds before the first retry; doubles with each retry (default: 2)")
+    parser.add_argument("--largest-first", action="store_true",
+                        help="collect repository sizes (GitLab API statistics, using GITLAB_TOKEN, or sizes "
+                             "recorded in --journal) and import the largest repositories first")
+    parser.add_argument("--estimate-mbps", type=float, default=10,
+                        help="per-worker transfer rate in MB/s used for the makespan estimate of "
+                             "--largest-first (default: 10)")
+    parser.add_argument("--journal",
+                        help="record each project's progress (created, cloned, pushed, verified) "
+                             "in this JSONL file")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue from the stages recorded in --journal instead of starting over")
+    parser.add_argument("--cache-dir",
+                        help="keep bare mirrors in this directory and update them incrementally on later runs")
+    parser.add_argument("--cache-max-gb", type=float,
+                        help="evict least recently used cached mirrors above this size (default: unlimited)")
+    parser.add_argument("--work-dir", default="/tmp",
+                        help="directory for temporary mirrors (default: /tmp)")
+    parser.add_argument("--disk-reserve-gb", type=float, default=0.0,
+                        help="free space to keep on the mirror filesystem; a clone of known size starts only "
+                             "when it fits above this reserve (default: 0)")
+    
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    args.object_families = []
+    for value in args.object_family:
+        pattern, sep, family = value.rpartition("=")
+        if not sep or not pattern or not family:
+            parser.error(f"--object-family expects REGEX=FAMILY, got '{value}'")
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            parser.error(f"--object-family: invalid regex '{pattern}': {e}")
+        args.object_families.append((pattern, family))
+    if args.object_families and not args.shared_objects:
+        parser.error("--object-family requires --shared-objects")
+    if args.workspace and not os.path.isdir(os.path.join(args.workspace, ".repo")):
+        parser.error(f"--workspace: no .repo directory found in '{args.workspace}'")
+    if args.refs and not args.lean:
+        parser.error("--refs requires --lean")
+    for pattern in args.refs:
+        if not pattern.startswith("refs/"):
+            parser.error(f"--refs: pattern must start with 'refs/', got '{pattern}'")
+    for pattern in args.include_refs + args.exclude_refs:
+        if not pattern.startswith("refs/") or pattern.count("*") > 1:
+            parser.error(f"ref pattern must start with 'refs/' and contain at most one '*', got '{pattern}'")
+    exclude = args.exclude_refs if args.keep_gitlab_refs else GITLAB_INTERNAL_REFS + args.exclude_refs
+    args.ref_filter = RefFilter(args.include_refs or None, exclude)
+    if args.max_push_mb < 0:
+        parser.error("--max-push-mb cannot be negative")
+    if args.max_blob_mb < 0:
+        parser.error("--max-blob-mb cannot be negative")
+    if args.lfs and not shutil.which("git-lfs"):
+        parser.error("--lfs requires git-lfs (https://git-lfs.com)")
+    if args.lfs_transfers < 1:
+        parser.error("--lfs-transfers must be at least 1")
+    for option in ("low_speed_limit", "low_speed_time", "git_timeout", "git_timeout_per_gb", "stall_retries"):
+        if getattr(args, option) < 0:
+            parser.error(f"--{option.replace('_', '-')} cannot be negative")
+    if args.estimate_mbps <= 0:
+        parser.error("--estimate-mbps must be positive")
+    if args.retries < 0:
+        parser.error("--retries cannot be negative")
+    if args.retry_delay < 0:
+        parser.error("--retry-delay cannot be negative")
+    if args.progress_interval < 0:
+        parser.error("--progress-interval cannot be negative")
+    if args.low_speed_limit and not args.low_speed_time:
+        parser.error("--low-speed-time must be positive when --low-speed-limit is set")
+    if args.resume and not args.journal:
+        parser.error("--resume requires --journal")
+    if args.cache_max_gb is not None and not args.cache_dir:
+        parser.error("--cache-max-gb requires --cache-dir")
+    if args.cache_max_gb is not None and args.cache_max_gb <= 0:
+        parser.error("--cache-max-gb must be positive")
+    if args.disk_reserve_gb < 0:
+        parser.error("--disk-reserve-gb cannot be negative")
+    if args.token_file and not os.path.isfile(args.token_file):
+        parser.error(f"--token-file: file not found: '{args.token_file}'")
+    if bool(args.app_id) != bool(args.app_key):
+        parser.error("--app-id and --app-key must be used together")
+    if args.app_installation_id and not args.app_id:
+        parser.error("--app-installation-id requires --app-id")
+    if args.app_key and not os.path.isfile(args.app_key):
+        parser.error(f"--app-key: file not found: '{args.app_key}'")
+    if args.app_id and jwt is None:
+        parser.error("--app-id requires the PyJWT package (pip install 'pyjwt[crypto]')")
+    if args.api_timeout <= 0:
+        parser.error("--api-timeout must be positive")
+    if args.api_rate <= 0:
+        parser.error("--api-rate must be positive")
+    for option in ("clone_jobs", "push_jobs", "queue_size"):
+        value = getattr(args, option)
+        if value is not None and value < 1:
+            parser.error(f"--{option.replace('_', '-')} must be at least 1")
+    if args.engine == "asyncio" and aiohttp is None:
+        parser.error("--engine asyncio requires the aiohttp package (pip install aiohttp)")
+    
+    return args
+
+
 def main():
+    args = parse_args()
+    
     print("""
 ============================================================
        GitLab to GitHub Repository Importer
@@ -256,13 +3049,20 @@ def main():
 ============================================================
     """)
     
+    github_tokens = os.getenv('GITHUB_TOKENS', '').replace(',', ' ').split()
+    if args.token_file:
+        with open(args.token_file) as f:
+            github_tokens += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    
     github_token = os.getenv('GITHUB_TOKEN')
+    if not github_token and github_tokens:
+        github_token = github_tokens.pop(0)
     
-    if not github_token:
+    if not github_token and not args.app_id:
         print("WARNING: GITHUB_TOKEN environment variable not set")
         github_token = input("Enter your GitHub Personal Access Token: ").strip()
     
-    if not github_token:
+    if not github_token and not args.app_id:
         print("ERROR: GitHub token is required!")
         sys.exit(1)
     
@@ -276,17 +3076,46 @@ def main():
     
     organization = select_target()
     
+    github_app = None
+    if args.app_id:
+        if not organization:
+            print("ERROR: GitHub App authentication requires an organization target")
+            sys.exit(1)
+        with open(args.app_key) as f:
+            github_app = GitHubAppAuth(args.app_id, f.read(), args.app_installation_id, organization,
+                                       timeout=args.api_timeout)
+    
     prefix = input("\nEnter prefix for GitHub repo names (optional, e.g., 'pixel-'): ").strip()
     
     gitlab_url = input("Enter GitLab base URL (default: https://gitlab.com): ").strip()
     if not gitlab_url:
         gitlab_url = "https://gitlab.com"
     
-    importer = GitLabToGitHub(github_token, gitlab_url, organization)
+    importer = GitLabToGitHub(github_token, gitlab_url, organization, jobs=args.jobs, engine=args.engine,
+                               clone_jobs=args.clone_jobs, push_jobs=args.push_jobs,
+                               queue_size=args.queue_size, api_rate=args.api_rate,
+                               api_timeout=args.api_timeout, cache_dir=args.cache_dir,
+                               cache_max_bytes=int(args.cache_max_gb * 1024 ** 3) if args.cache_max_gb else None,
+                               sync=args.sync, journal_path=args.journal, resume=args.resume,
+                               preflight=args.preflight, shared_objects=args.shared_objects,
+                               object_families=args.object_families, workspace=args.workspace,
+                               lean=args.lean, ref_patterns=args.refs, ref_filter=args.ref_filter,
+                               max_push_bytes=int(args.max_push_mb * 1024 ** 2),
+                               max_blob_bytes=int(args.max_blob_mb * 1024 ** 2),
+                               lfs=args.lfs, lfs_transfers=args.lfs_transfers,
+                               low_speed_limit=args.low_speed_limit, low_speed_time=args.low_speed_time,
+                               git_timeout=args.git_timeout, git_timeout_per_gb=args.git_timeout_per_gb,
+                               stall_retries=args.stall_retries, log_dir=args.log_dir,
+                               progress_interval=args.progress_interval,
+                               retry_policy=RetryPolicy(args.retries, args.retry_delay),
+                               github_tokens=github_tokens, github_app=github_app,
+                               largest_first=args.largest_first, gitlab_token=os.getenv('GITLAB_TOKEN'),
+                               estimate_rate=args.estimate_mbps * 1024 ** 2, work_dir=args.work_dir,
+                               disk_reserve_bytes=int(args.disk_reserve_gb * 1024 ** 3))
     
-    if organization:
+    if organization and not github_app:
         print(f"\nVerifying access to organization '{organization}'...")
-        orgs = importer.get_user_organizations()
+        orgs = importer.list_organizations()
         if organization not in orgs:
             print(f"WARNING: You may not have access to organization '{organization}'")
             print(f"   Available organizations: {', '.join(orgs) if orgs else 'None'}")